@@ -1,3 +1,5 @@
+import os
+
 DB_USER = "root"
 DB_PASSWORD = "password"   # change to your real password
 DB_HOST = "127.0.0.1"
@@ -7,3 +9,9 @@ DB_NAME = "parking_db"
 SQLALCHEMY_DATABASE_URI = (
     f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 )
+
+# Shared secret for HMAC-signed CV service calls to /api/internal
+INTERNAL_API_SECRET = os.getenv("INTERNAL_API_SECRET", "")
+
+# How far X-Timestamp on a signed internal request may drift from server time
+INTERNAL_SIGNATURE_MAX_AGE = int(os.getenv("INTERNAL_SIGNATURE_MAX_AGE", "300"))
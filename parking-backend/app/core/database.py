@@ -1,11 +1,32 @@
+from contextvars import ContextVar
+from typing import Optional
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from sqlalchemy.orm import sessionmaker, scoped_session, declarative_base, Session
 from app.core.config import SQLALCHEMY_DATABASE_URI
 
 engine = create_engine(SQLALCHEMY_DATABASE_URI, echo=True, future=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Identifier of the request currently being served; set by the
+# db_session middleware in app.main
+request_scope: ContextVar[Optional[int]] = ContextVar("request_scope", default=None)
+
+# One session per request, reused by every db_session() call made while
+# serving it and released by the middleware once the response is sent
+request_sessions = scoped_session(SessionLocal, scopefunc=request_scope.get)
+
+def db_session() -> Session:
+    """
+    Get the database session for the current request.
+    
+    Outside a request (startup hooks, scripts, background tasks) there is no
+    scope to share, so a fresh session is returned and the caller must close it.
+    """
+    if request_scope.get() is None:
+        return SessionLocal()
+    return request_sessions()
+
 def get_db() -> Session:
     """Database session dependency."""
     db = SessionLocal()
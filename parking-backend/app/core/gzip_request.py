@@ -0,0 +1,73 @@
+import zlib
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Decompressed request bodies above this size are rejected, so a small
+# gzip bomb cannot expand into memory
+MAX_DECOMPRESSED_BYTES = 10 * 1024 * 1024
+
+class GzipRequestMiddleware:
+    """
+    Decompress `Content-Encoding: gzip` request bodies on API routes.
+    
+    Starlette only compresses responses; without this, gzipped bodies
+    (e.g. CV entries carrying a plate image) reach the routers as
+    undecodable bytes. Other requests pass through untouched.
+    """
+    
+    def __init__(self, app: ASGIApp, prefix: str = "/api/"):
+        self.app = app
+        self.prefix = prefix
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefix):
+            await self.app(scope, receive, send)
+            return
+        
+        headers = scope["headers"]
+        encoding = next((value for name, value in headers if name == b"content-encoding"), b"")
+        if encoding.strip().lower() != b"gzip":
+            await self.app(scope, receive, send)
+            return
+        
+        body = bytearray()
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+        
+        # 16 + MAX_WBITS selects the gzip container format
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        error = None
+        try:
+            data = decompressor.decompress(bytes(body), MAX_DECOMPRESSED_BYTES)
+            if decompressor.unconsumed_tail:
+                error = "Decompressed request body too large"
+            elif not decompressor.eof:
+                error = "Truncated gzip request body"
+        except zlib.error:
+            error = "Invalid gzip request body"
+        
+        if error:
+            await JSONResponse({"detail": error}, status_code=400)(scope, receive, send)
+            return
+        
+        scope = dict(scope)
+        scope["headers"] = [
+            (name, value) for name, value in headers
+            if name not in (b"content-encoding", b"content-length")
+        ] + [(b"content-length", str(len(data)).encode())]
+        
+        delivered = False
+        
+        async def receive_decompressed():
+            nonlocal delivered
+            if not delivered:
+                delivered = True
+                return {"type": "http.request", "body": data, "more_body": False}
+            return await receive()
+        
+        await self.app(scope, receive_decompressed, send)
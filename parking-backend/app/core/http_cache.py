@@ -0,0 +1,59 @@
+import hashlib
+from typing import Any, Optional
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.models.floor import Floor
+from app.models.slot import Slot
+from app.models.ticket import Ticket
+
+SLOTS_CACHE_CONTROL = "private, must-revalidate"
+
+def slots_etag(db: Session) -> str:
+    """
+    Build an ETag from the current slot, floor counter and ticket state.
+    
+    The latest change timestamps alone miss deleted rows, so row counts and
+    an id checksum are folded in, along with the floor counters the overview
+    reports. Everything is read in a single round trip.
+    """
+    state = db.execute(select(
+        select(func.max(Slot.last_updated)).scalar_subquery(),
+        select(func.count(Slot.id)).scalar_subquery(),
+        select(func.sum(Slot.id)).scalar_subquery(),
+        select(func.sum(Floor.occupied_car_slots)).scalar_subquery(),
+        select(func.sum(Floor.occupied_bike_slots)).scalar_subquery(),
+        select(func.max(Ticket.updated_at)).scalar_subquery(),
+        select(func.count(Ticket.id)).scalar_subquery()
+    )).one()
+    return '"' + hashlib.md5(repr(tuple(state)).encode()).hexdigest() + '"'
+
+def apply_slots_etag(request: Request, response: Response, db: Session) -> Optional[Response]:
+    """
+    Attach ETag/Cache-Control headers for slot listings.
+    
+    Returns a 304 response when the client's If-None-Match is still current,
+    otherwise sets the headers on the outgoing response and returns None.
+    """
+    etag = slots_etag(db)
+    headers = {"ETag": etag, "Cache-Control": SLOTS_CACHE_CONTROL}
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    
+    response.headers.update(headers)
+    return None
+
+def adapter_response(adapter: TypeAdapter, data: Any, response: Response) -> Response:
+    """
+    Serialize data in one pass with a prebuilt TypeAdapter.
+    
+    Headers already set on the injected response (e.g. the ETag) are carried
+    over to the returned response.
+    """
+    return Response(
+        content=adapter.dump_json(data, by_alias=True),
+        media_type="application/json",
+        headers=dict(response.headers)
+    )
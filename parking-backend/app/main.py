@@ -1,7 +1,8 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.core.database import Base, engine
-from app.routers import entry, exit, health, occupancy, slots
+from app.core.database import Base, engine, request_sessions, request_scope
+from app.core.gzip_request import GzipRequestMiddleware
+from app.routers import entry, exit, health, internal, occupancy, slots
 
 app = FastAPI(
     title="Parking Management System",
@@ -18,6 +19,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Accept gzip-compressed request bodies (sent by the CV service for image payloads)
+app.add_middleware(GzipRequestMiddleware)
+
+@app.middleware("http")
+async def db_session_middleware(request: Request, call_next):
+    """Scope the shared database session to the lifetime of a request."""
+    token = request_scope.set(id(request))
+    try:
+        return await call_next(request)
+    finally:
+        request_sessions.remove()
+        request_scope.reset(token)
+
 @app.on_event("startup")
 def on_startup():
     """Create database tables on startup."""
@@ -29,6 +43,7 @@ app.include_router(entry.router)
 app.include_router(exit.router)
 app.include_router(slots.router)
 app.include_router(occupancy.router)
+app.include_router(internal.router)
 
 @app.get("/")
 def root():
@@ -1,5 +1,6 @@
 import enum
-from sqlalchemy import Column, Integer, String, Enum, DateTime, ForeignKey, func, Boolean
+from sqlalchemy import Column, Integer, String, Enum, DateTime, ForeignKey, func, Boolean, Index
+from sqlalchemy.dialects import mysql
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -22,6 +23,10 @@ class Slot(Base):
     Floor B: 20 car slots (B-C-01 to B-C-20), 16 bike slots (B-B-01 to B-B-16)
     """
     __tablename__ = "slots"
+    __table_args__ = (
+        # Covers the floor/status/type filters used by the slot listing endpoints
+        Index("ix_slots_floor_status_type", "floor_id", "status", "slot_type"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     floor_id = Column(Integer, ForeignKey("floors.id"), nullable=False)
@@ -32,7 +37,8 @@ class Slot(Base):
     camera_id = Column(Integer, ForeignKey("cameras.id"), nullable=True)  # Assigned camera
     roi_coordinates = Column(String(100), nullable=True)  # ROI for CV detection (x,y,w,h)
     is_misparked = Column(Boolean, default=False)  # For v2 - misparking detection
-    last_updated = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Microsecond precision so changes within the same second still move the slots ETag
+    last_updated = Column(mysql.DATETIME(fsp=6), server_default=func.now(6), onupdate=func.now(6))
 
     # Relationships
     floor = relationship("Floor", back_populates="slots")
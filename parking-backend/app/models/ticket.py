@@ -1,5 +1,6 @@
 import enum
 from sqlalchemy import Column, Integer, String, Enum, DateTime, ForeignKey, func
+from sqlalchemy.dialects import mysql
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -37,7 +38,8 @@ class Ticket(Base):
     entry_image_path = Column(String(255), nullable=True)  # Path to entry snapshot
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Microsecond precision so changes within the same second still move the slots ETag
+    updated_at = Column(mysql.DATETIME(fsp=6), server_default=func.now(6), onupdate=func.now(6))
 
     # Relationships
     slot = relationship("Slot", back_populates="tickets")
@@ -1,4 +1,4 @@
 # API routers package
-from . import entry, exit, health, occupancy, slots
+from . import entry, exit, health, internal, occupancy, slots
 
-__all__ = ["entry", "exit", "health", "occupancy", "slots"]
\ No newline at end of file
+__all__ = ["entry", "exit", "health", "internal", "occupancy", "slots"]
\ No newline at end of file
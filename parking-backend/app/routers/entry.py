@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from app.core.database import get_db
+from sqlalchemy import and_, func
+from app.core.database import db_session
+from app.core.http_cache import adapter_response
 from app.models.event_log import EventLog
 from app.models.slot import Slot, SlotStatus, SlotType
 from app.models.ticket import Ticket, TicketStatus, VehicleType
 from app.models.floor import Floor
-from app.schemas.ticket import TicketCreate, TicketResponse
+from app.schemas.ticket import TicketCreate, TicketResponse, TICKET_RESPONSE_ADAPTER
 from datetime import datetime
 from typing import List, Optional
 import logging
@@ -133,8 +134,7 @@ class SmartSlotAssigner:
 @router.post(\"/entry-events\", response_model=TicketResponse, status_code=status.HTTP_201_CREATED)
 async def create_entry_event(
     ticket_data: TicketCreate,
-    preferred_floor: Optional[str] = None,
-    db: Session = Depends(get_db)
+    preferred_floor: Optional[str] = None
 ):
     \"\"\"
     Create a new entry event with automatic slot assignment
@@ -149,11 +149,11 @@ async def create_entry_event(
     Args:
         ticket_data: Vehicle information from CV detection
         preferred_floor: Optional floor preference ('A' or 'B')
-        db: Database session
         
     Returns:
         Parking ticket with assigned slot information
     \"\"\"
+    db = db_session()
     try:
         # Validate vehicle type
         if ticket_data.vehicle_type.upper() not in ['CAR', 'BIKE']:
@@ -213,7 +213,7 @@ async def create_entry_event(
         # Update slot status
         optimal_slot.status = SlotStatus.OCCUPIED
         optimal_slot.current_plate = ticket_data.license_plate
-        optimal_slot.last_updated = datetime.utcnow()
+        optimal_slot.last_updated = func.now(6)
         
         # Update floor occupancy counters
         floor = db.query(Floor).filter(Floor.id == optimal_slot.floor_id).first()
@@ -257,12 +257,13 @@ async def create_entry_event(
         )
 
 @router.get(\"/parking-availability\")
-async def get_parking_availability(db: Session = Depends(get_db)):
+async def get_parking_availability():
     \"\"\"
     Get current parking availability across all floors
     
     Returns real-time availability for cars and bikes on each floor
     \"\"\"
+    db = db_session()
     try:
         availability = SmartSlotAssigner.get_parking_availability(db)
         
@@ -300,8 +301,7 @@ async def get_parking_availability(db: Session = Depends(get_db)):
 
 @router.post(\"/cv-entry-detection\")
 async def handle_cv_entry_detection(
-    detection_data: dict,
-    db: Session = Depends(get_db)
+    detection_data: dict
 ):
     \"\"\"
     Handle vehicle detection from CV system at entry gate
@@ -313,11 +313,11 @@ async def handle_cv_entry_detection(
     
     Args:
         detection_data: CV detection information
-        db: Database session
         
     Returns:
         Processing result with slot assignment
     \"\"\"
+    db = db_session()
     try:
         # Extract detection information
         camera_id = detection_data.get('camera_id')
@@ -353,7 +353,7 @@ async def handle_cv_entry_detection(
         )
         
         # Process entry
-        ticket_response = await create_entry_event(ticket_create, None, db)
+        ticket_response = await create_entry_event(ticket_create, None)
         
         # Log CV detection
         cv_log = EventLog.log_cv_detection(
@@ -385,12 +385,12 @@ async def handle_cv_entry_detection(
 
 @router.get(\"/entry-events\", response_model=List[TicketResponse])
 async def get_entry_events(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     active_only: bool = False,
     vehicle_type: Optional[str] = None,
-    floor: Optional[str] = None,
-    db: Session = Depends(get_db)
+    floor: Optional[str] = None
 ):
     \"\"\"
     Get list of entry events with filtering options
@@ -401,11 +401,11 @@ async def get_entry_events(
         active_only: Filter for active tickets only
         vehicle_type: Filter by vehicle type ('CAR' or 'BIKE')
         floor: Filter by floor ('A' or 'B')
-        db: Database session
         
     Returns:
         List of ticket records
     \"\"\"
+    db = db_session()
     try:
         query = db.query(Ticket)
         
@@ -423,7 +423,11 @@ async def get_entry_events(
         query = query.order_by(Ticket.entry_time.desc())
         
         tickets = query.offset(skip).limit(limit).all()
-        return tickets
+        return adapter_response(
+            TICKET_RESPONSE_ADAPTER,
+            [TicketResponse.from_orm_fast(ticket) for ticket in tickets],
+            response
+        )
         
     except Exception as e:
         logger.error(f\"Failed to get entry events: {e}\")
@@ -433,8 +437,9 @@ async def get_entry_events(
         )
 
 @router.get(\"/entry-events/{ticket_id}\", response_model=TicketResponse)
-async def get_entry_event(ticket_id: int, db: Session = Depends(get_db)):
+async def get_entry_event(ticket_id: int):
     \"\"\"Get specific entry event by ticket ID\"\"\"
+    db = db_session()
     ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
     if not ticket:
         raise HTTPException(
@@ -444,8 +449,9 @@ async def get_entry_event(ticket_id: int, db: Session = Depends(get_db)):
     return ticket
 
 @router.get(\"/entry-events/license/{license_plate}\", response_model=TicketResponse)
-async def get_entry_event_by_license(license_plate: str, db: Session = Depends(get_db)):
+async def get_entry_event_by_license(license_plate: str):
     \"\"\"Get active entry event by license plate\"\"\"
+    db = db_session()
     ticket = db.query(Ticket).filter(
         and_(
             Ticket.plate_number == license_plate,
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func
+from app.core.database import db_session
 from app.models.event_log import EventLog
 from app.models.slot import Slot, SlotStatus
 from app.models.ticket import Ticket, TicketStatus
@@ -13,12 +14,12 @@ router = APIRouter(prefix="/api/v1", tags=["exit"])
 @router.post("/exit-events/{ticket_id}", response_model=TicketCloseResponse)
 async def create_exit_event(
     ticket_id: int,
-    exit_data: TicketCloseRequest = None,
-    db: Session = Depends(get_db)
+    exit_data: TicketCloseRequest = None
 ):
     """
     Create an exit event and close the parking ticket.
     """
+    db = db_session()
     # Find the active ticket
     ticket = db.query(Ticket).filter(
         Ticket.id == ticket_id,
@@ -50,18 +51,19 @@ async def create_exit_event(
         # Update slot status
         slot.status = SlotStatus.FREE
         slot.current_plate = None
-        slot.last_updated = datetime.utcnow()
+        slot.last_updated = func.now(6)
         
         # Calculate parking duration
         duration = exit_time - ticket.entry_time
         parking_duration_minutes = int(duration.total_seconds() / 60)
         
         # Log exit event
-        exit_log = EventLog.log_exit_event(
+        event_logs = [EventLog.log_exit_event(
             slot_id=slot.id,
-            license_plate=ticket.plate_number
-        )
-        db.add(exit_log)
+            license_plate=ticket.plate_number,
+            vehicle_type=ticket.vehicle_type
+        )]
+        db.bulk_save_objects(event_logs)
         
         db.commit()
         db.refresh(ticket)
@@ -90,12 +92,12 @@ async def create_exit_event(
 @router.post("/exit-events/license/{license_plate}", response_model=TicketCloseResponse)
 async def create_exit_event_by_license(
     license_plate: str,
-    exit_data: TicketCloseRequest = None,
-    db: Session = Depends(get_db)
+    exit_data: TicketCloseRequest = None
 ):
     """
     Create an exit event by license plate number.
     """
+    db = db_session()
     # Find the active ticket by license plate
     ticket = db.query(Ticket).filter(
         Ticket.plate_number == license_plate,
@@ -109,38 +111,48 @@ async def create_exit_event_by_license(
         )
     
     # Call the main exit event function
-    return await create_exit_event(ticket.id, exit_data, db)
+    return await create_exit_event(ticket.id, exit_data)
 
-@router.get("/exit-events", response_model=List[TicketCloseResponse])
+@router.get("/exit-events", response_model=List[TicketCloseResponse], response_class=ORJSONResponse)
 async def get_exit_events(
     skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+    limit: int = 100
 ):
     """
     Get list of completed exit events.
+    
+    Rows are projected straight into plain dicts and encoded with orjson,
+    skipping ORM instances and per-row Pydantic validation.
     """
-    tickets = db.query(Ticket).filter(
+    db = db_session()
+    rows = db.query(
+        Ticket.id,
+        Ticket.plate_number,
+        Ticket.vehicle_type,
+        Ticket.slot_id,
+        Ticket.entry_time,
+        Ticket.exit_time,
+        Ticket.status
+    ).filter(
         Ticket.status == TicketStatus.CLOSED
-    ).offset(skip).limit(limit).all()
+    ).offset(skip).limit(limit)
     
     responses = []
-    for ticket in tickets:
+    for row in rows:
         duration = None
-        if ticket.exit_time and ticket.entry_time:
-            duration_delta = ticket.exit_time - ticket.entry_time
+        if row.exit_time and row.entry_time:
+            duration_delta = row.exit_time - row.entry_time
             duration = int(duration_delta.total_seconds() / 60)
-            
-        response = TicketCloseResponse(
-            id=ticket.id,
-            license_plate=ticket.plate_number,
-            vehicle_type=ticket.vehicle_type,
-            slot_id=ticket.slot_id,
-            entry_time=ticket.entry_time,
-            exit_time=ticket.exit_time,
-            status=ticket.status,
-            parking_duration_minutes=duration
-        )
-        responses.append(response)
+        
+        responses.append({
+            "id": row.id,
+            "plate_number": row.plate_number,
+            "vehicle_type": row.vehicle_type,
+            "slot_id": row.slot_id,
+            "entry_time": row.entry_time,
+            "exit_time": row.exit_time,
+            "status": row.status,
+            "parking_duration_minutes": duration
+        })
     
-    return responses
\ No newline at end of file
+    return ORJSONResponse(content=responses)
@@ -1,37 +1,82 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import text
-from app.core.database import get_db, engine
+from fastapi import APIRouter, HTTPException, status, Response
+from sqlalchemy import text, update
+from app.core.database import db_session, engine
 from app.core.config import settings
 from app.models.camera import Camera
 from datetime import datetime
 from typing import Dict, Any
+from icmplib import async_ping
+from icmplib.exceptions import ICMPLibError
+import asyncio
 import platform
 import psutil
-import subprocess
+import time
 import os
 
 router = APIRouter()
 
-@router.get("/health", response_model=Dict[str, Any])
+CAMERA_PROBE_TIMEOUT = 1
+CAMERA_PROBE_PORT = 80
+
+# Pre-serialized bodies for the load balancer endpoints; only the timestamp varies
+_HEALTH_PREFIX = (
+    b'{"status":"healthy","service":"Parking Management API","version":"1.0.0","environment":"'
+    + os.getenv("ENVIRONMENT", "development").encode()
+    + b'","timestamp":"'
+)
+_PING_PREFIX = b'{"status":"ok","timestamp":"'
+_JSON_SUFFIX = b'"}'
+
+_cached_ts_value = b""
+_cached_ts_second = -1.0
+
+def _cached_ts() -> bytes:
+    """Return the current UTC ISO timestamp, refreshed at most once per second."""
+    global _cached_ts_value, _cached_ts_second
+    now = time.monotonic()
+    if now - _cached_ts_second >= 1.0:
+        _cached_ts_value = datetime.utcnow().isoformat().encode()
+        _cached_ts_second = now
+    return _cached_ts_value
+
+async def _probe_camera(ip: str) -> bool:
+    """
+    Check whether a camera host is reachable without spawning a ping process.
+    Uses an unprivileged ICMP echo and falls back to a TCP connect when raw
+    sockets are not available on the host.
+    """
+    try:
+        host = await async_ping(ip, count=1, timeout=CAMERA_PROBE_TIMEOUT, privileged=False)
+        return host.is_alive
+    except (ICMPLibError, OSError):
+        pass
+    
+    try:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(ip, CAMERA_PROBE_PORT), CAMERA_PROBE_TIMEOUT
+        )
+        writer.close()
+        return True
+    except (asyncio.TimeoutError, OSError):
+        return False
+
+@router.get("/health", response_class=Response)
 async def health_check():
     """
     Basic health check endpoint.
     Returns API status and basic system information.
     """
-    return {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "service": "Parking Management API",
-        "version": "1.0.0",
-        "environment": os.getenv("ENVIRONMENT", "development")
-    }
+    return Response(
+        content=_HEALTH_PREFIX + _cached_ts() + _JSON_SUFFIX,
+        media_type="application/json"
+    )
 
 @router.get("/health/detailed", response_model=Dict[str, Any])
-async def detailed_health_check(db: Session = Depends(get_db)):
+async def detailed_health_check():
     """
     Detailed health check including database, system resources, and external dependencies.
     """
+    db = db_session()
     health_status = {
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
@@ -85,31 +130,37 @@ async def detailed_health_check(db: Session = Depends(get_db)):
     
     # Camera connectivity check
     try:
-        cameras = db.query(Camera).filter(Camera.is_active == True).all()
+        cameras = db.query(Camera.id, Camera.camera_ip).filter(Camera.is_active == True).all()
         camera_stats = {
             "total_cameras": len(cameras),
             "online_cameras": 0,
             "offline_cameras": 0
         }
         
-        for camera in cameras:
-            try:
-                # Simple ping check (simplified for demo)
-                response = subprocess.run(
-                    ["ping", "-n", "1", "-w", "1000", camera.camera_ip] if platform.system() == "Windows"
-                    else ["ping", "-c", "1", "-W", "1", camera.camera_ip],
-                    capture_output=True, text=True, timeout=2
-                )
-                if response.returncode == 0:
-                    camera.is_online = True
-                    camera.last_ping = datetime.utcnow()
-                    camera_stats["online_cameras"] += 1
-                else:
-                    camera.is_online = False
-                    camera_stats["offline_cameras"] += 1
-            except:
-                camera.is_online = False
-                camera_stats["offline_cameras"] += 1
+        # Probe all cameras concurrently
+        results = await asyncio.gather(
+            *(_probe_camera(camera.camera_ip) for camera in cameras),
+            return_exceptions=True
+        )
+        
+        online_ids = [camera.id for camera, online in zip(cameras, results) if online is True]
+        offline_ids = [camera.id for camera, online in zip(cameras, results) if online is not True]
+        camera_stats["online_cameras"] = len(online_ids)
+        camera_stats["offline_cameras"] = len(offline_ids)
+        
+        # Persist probe results with at most two bulk UPDATEs
+        if online_ids:
+            db.execute(
+                update(Camera)
+                .where(Camera.id.in_(online_ids))
+                .values(is_online=True, last_ping=datetime.utcnow())
+            )
+        if offline_ids:
+            db.execute(
+                update(Camera)
+                .where(Camera.id.in_(offline_ids))
+                .values(is_online=False)
+            )
         
         db.commit()
         
@@ -137,10 +188,11 @@ async def detailed_health_check(db: Session = Depends(get_db)):
     return health_status
 
 @router.get("/health/database", response_model=Dict[str, Any])
-async def database_health(db: Session = Depends(get_db)):
+async def database_health():
     """
     Specific database health check with connection pool and query performance info.
     """
+    db = db_session()
     try:
         # Test basic connectivity
         start_time = datetime.utcnow()
@@ -183,10 +235,11 @@ async def database_health(db: Session = Depends(get_db)):
         }
 
 @router.get("/health/cameras", response_model=Dict[str, Any])
-async def cameras_health(db: Session = Depends(get_db)):
+async def cameras_health():
     """
     Check connectivity and status of all registered cameras.
     """
+    db = db_session()
     try:
         cameras = db.query(Camera).all()
         camera_details = []
@@ -231,12 +284,12 @@ async def cameras_health(db: Session = Depends(get_db)):
             "error": str(e)
         }
 
-@router.get("/health/ping", response_model=Dict[str, str])
+@router.get("/health/ping", response_class=Response)
 async def ping():
     """
     Simple ping endpoint for load balancers and monitoring.
     """
-    return {
-        "status": "ok",
-        "timestamp": datetime.utcnow().isoformat()
-    }
\ No newline at end of file
+    return Response(
+        content=_PING_PREFIX + _cached_ts() + _JSON_SUFFIX,
+        media_type="application/json"
+    )
\ No newline at end of file
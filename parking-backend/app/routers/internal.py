@@ -0,0 +1,201 @@
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import and_, insert
+from app.core.config import INTERNAL_API_SECRET, INTERNAL_SIGNATURE_MAX_AGE
+from app.core.database import db_session
+from app.models.event_log import EventLog
+from app.models.floor import Floor
+from app.models.slot import SlotStatus
+from app.models.ticket import Ticket, TicketStatus, VehicleType
+from app.routers.entry import SmartSlotAssigner
+from app.schemas.base import LICENSE_PLATE_PATTERN
+from datetime import datetime
+from typing import Optional, Tuple, TypedDict
+import hashlib
+import hmac
+import logging
+import orjson
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/internal", tags=["internal"])
+
+# CV detector class names that park in bike slots; everything else is a car
+_BIKE_CLASSES = {"bike", "motorcycle", "motorbike", "bicycle"}
+
+# Same plate format TicketCreate enforces on the public entry endpoint
+_PLATE_RE = re.compile(LICENSE_PLATE_PATTERN)
+
+class InternalEntryPayload(TypedDict, total=False):
+    """Shape of the entry payload posted by the CV service (not validated)."""
+    plate_number: str
+    vehicle_type: str
+    timestamp: str
+    confidence: float
+    camera_id: Optional[int]
+
+def _verify_signature(body: bytes, timestamp: Optional[str], signature: Optional[str]):
+    """
+    Check the X-Signature header against an HMAC-SHA256 of "<X-Timestamp>.<body>".
+    
+    Signing the timestamp lets requests older than INTERNAL_SIGNATURE_MAX_AGE
+    seconds be rejected, so a captured request cannot be replayed later.
+    """
+    if not INTERNAL_API_SECRET:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Internal API is not configured"
+        )
+    
+    try:
+        signed_at = int(timestamp)
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing or invalid X-Timestamp"
+        )
+    
+    if abs(time.time() - signed_at) > INTERNAL_SIGNATURE_MAX_AGE:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Signature expired"
+        )
+    
+    expected = hmac.new(
+        INTERNAL_API_SECRET.encode(), timestamp.encode() + b"." + body, hashlib.sha256
+    ).hexdigest()
+    if not signature or not hmac.compare_digest(expected, signature):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid signature"
+        )
+
+def _parse_entry(body: bytes) -> Tuple[str, VehicleType, datetime, Optional[int], Optional[str]]:
+    """
+    Decode and check an entry payload, raising 400 on anything malformed.
+    
+    Returns:
+        Tuple of (license plate, vehicle type, entry time, camera id,
+        confidence formatted to two decimals for the String(10) columns)
+    """
+    try:
+        payload: InternalEntryPayload = orjson.loads(body)
+        license_plate = payload["plate_number"]
+        vehicle_type = (
+            VehicleType.BIKE if payload.get("vehicle_type", "").lower() in _BIKE_CLASSES
+            else VehicleType.CAR
+        )
+        timestamp = payload.get("timestamp")
+        entry_time = datetime.fromisoformat(timestamp) if timestamp else datetime.utcnow()
+    except (orjson.JSONDecodeError, AttributeError, KeyError, TypeError, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Malformed entry payload: {e}"
+        )
+    
+    if not isinstance(license_plate, str) or not _PLATE_RE.match(license_plate):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid license plate: {license_plate!r}"
+        )
+    
+    confidence = payload.get("confidence")
+    if confidence is not None:
+        if isinstance(confidence, bool) or not isinstance(confidence, (int, float)) \
+                or not 0 <= confidence <= 1:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid confidence: {confidence!r}"
+            )
+        confidence = f"{confidence:.2f}"
+    
+    return license_plate, vehicle_type, entry_time, payload.get("camera_id"), confidence
+
+@router.post("/entries", status_code=status.HTTP_201_CREATED)
+async def create_internal_entry(request: Request):
+    """
+    Register a vehicle entry reported by the CV service.
+    
+    Machine-to-machine counterpart of /api/v1/entry-events: the body is
+    HMAC-signed and written with direct inserts instead of going through
+    the ORM unit of work, but gets the same plate and active-ticket checks.
+    """
+    body = await request.body()
+    _verify_signature(body, request.headers.get("X-Timestamp"), request.headers.get("X-Signature"))
+    
+    license_plate, vehicle_type, entry_time, camera_id, confidence = _parse_entry(body)
+    
+    db = db_session()
+    try:
+        # Check if vehicle already has an active ticket
+        existing_ticket = db.query(Ticket).filter(
+            and_(
+                Ticket.plate_number == license_plate,
+                Ticket.status == TicketStatus.ACTIVE
+            )
+        ).first()
+        
+        if existing_ticket:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Vehicle {license_plate} already has active ticket {existing_ticket.id}"
+            )
+        
+        slot = SmartSlotAssigner.find_optimal_slot(db, vehicle_type.value)
+        if not slot:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"No available {vehicle_type.value} parking slots"
+            )
+        
+        result = db.execute(
+            insert(Ticket).values(
+                plate_number=license_plate,
+                vehicle_type=vehicle_type,
+                slot_id=slot.id,
+                entry_time=entry_time,
+                status=TicketStatus.ACTIVE,
+                entry_camera_id=camera_id,
+                entry_confidence=confidence
+            )
+        )
+        ticket_id = result.inserted_primary_key[0]
+        
+        slot.status = SlotStatus.OCCUPIED
+        slot.current_plate = license_plate
+        
+        floor = db.get(Floor, slot.floor_id)
+        if floor:
+            if vehicle_type == VehicleType.CAR:
+                floor.occupied_car_slots += 1
+            else:
+                floor.occupied_bike_slots += 1
+        
+        db.bulk_save_objects([EventLog.log_entry_event(
+            slot_id=slot.id,
+            license_plate=license_plate,
+            vehicle_type=vehicle_type.value,
+            camera_id=camera_id,
+            confidence=confidence
+        )])
+        db.commit()
+        
+        logger.info(f"Internal entry: {license_plate} assigned to slot {slot.slot_code}")
+        
+        return ORJSONResponse(
+            {"ticket_id": ticket_id, "slot_id": slot.id, "slot_code": slot.slot_code},
+            status_code=status.HTTP_201_CREATED
+        )
+        
+    except HTTPException:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Internal entry failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to process entry: {str(e)}"
+        )
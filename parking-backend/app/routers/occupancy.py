@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.core.database import get_db
+from fastapi import APIRouter, HTTPException, status, Query, Request, Response
+from sqlalchemy import func, insert
+from app.core.database import db_session
+from app.core.http_cache import apply_slots_etag, adapter_response
 from app.models.floor import Floor
 from app.models.slot import Slot
 from app.models.ticket import Ticket
@@ -9,7 +9,7 @@ from app.models.event_log import EventLog
 from app.schemas.slot import (
     SlotResponse, SlotOccupancyRequest, SlotOccupancyResponse,
     SlotVacateRequest, SlotVacateResponse, FloorOccupancyResponse,
-    ParkingOverviewResponse
+    ParkingOverviewResponse, SLOT_RESPONSE_ADAPTER
 )
 from datetime import datetime
 from typing import List, Optional
@@ -17,10 +17,15 @@ from typing import List, Optional
 router = APIRouter()
 
 @router.get("/slot-occupancy", response_model=ParkingOverviewResponse)
-async def get_parking_overview(db: Session = Depends(get_db)):
+async def get_parking_overview(request: Request, response: Response):
     """
     Get overall parking occupancy overview including all floors.
     """
+    db = db_session()
+    cached = apply_slots_etag(request, response, db)
+    if cached:
+        return cached
+    
     # Get floor occupancy data
     floors_data = db.query(Floor).filter(Floor.is_active == True).all()
     
@@ -72,13 +77,16 @@ async def get_parking_overview(db: Session = Depends(get_db)):
 
 @router.get("/slot-occupancy/floor/{floor_id}", response_model=List[SlotResponse])
 async def get_floor_slots(
+    request: Request,
+    response: Response,
     floor_id: int,
-    occupied_only: Optional[bool] = Query(None, description="Filter by occupancy status"),
-    db: Session = Depends(get_db)
+    occupied_only: Optional[bool] = Query(None, description="Filter by occupancy status")
 ):
     """
     Get all slots for a specific floor with their occupancy status.
     """
+    db = db_session()
+    
     # Verify floor exists
     floor = db.query(Floor).filter(Floor.id == floor_id).first()
     if not floor:
@@ -87,25 +95,31 @@ async def get_floor_slots(
             detail=f"Floor with id {floor_id} not found"
         )
     
+    cached = apply_slots_etag(request, response, db)
+    if cached:
+        return cached
+    
     query = db.query(Slot).filter(Slot.floor_id == floor_id)
     
     if occupied_only is not None:
         query = query.filter(Slot.is_occupied == occupied_only)
     
     slots = query.all()
-    return slots
+    return adapter_response(
+        SLOT_RESPONSE_ADAPTER, [SlotResponse.from_orm_fast(slot) for slot in slots], response
+    )
 
 @router.post("/slot-occupancy/{slot_id}/occupy", response_model=SlotOccupancyResponse)
 async def occupy_slot(
     slot_id: int,
     occupancy_data: SlotOccupancyRequest,
-    create_ticket: bool = Query(True, description="Whether to create a parking ticket"),
-    db: Session = Depends(get_db)
+    create_ticket: bool = Query(True, description="Whether to create a parking ticket")
 ):
     """
     Mark a slot as occupied by a vehicle.
     Optionally create a parking ticket for billing.
     """
+    db = db_session()
     slot = db.query(Slot).filter(Slot.id == slot_id).first()
     if not slot:
         raise HTTPException(
@@ -136,6 +150,7 @@ async def occupy_slot(
         
         ticket_created = False
         ticket_id = None
+        event_logs = []
         
         # Create ticket if requested
         if create_ticket:
@@ -146,23 +161,25 @@ async def occupy_slot(
             ).first()
             
             if not existing_ticket:
-                new_ticket = Ticket(
-                    slot_id=slot_id,
-                    license_plate=occupancy_data.license_plate,
-                    vehicle_type=occupancy_data.vehicle_type,
-                    entry_time=entry_time
+                # Single INSERT; the new id comes back without a separate flush
+                result = db.execute(
+                    insert(Ticket).values(
+                        slot_id=slot_id,
+                        plate_number=occupancy_data.license_plate,
+                        vehicle_type=occupancy_data.vehicle_type,
+                        entry_time=entry_time
+                    )
                 )
-                db.add(new_ticket)
                 ticket_created = True
-                db.flush()
-                ticket_id = new_ticket.id
+                ticket_id = result.inserted_primary_key[0]
         
         # Log occupancy event
-        occupancy_log = EventLog.log_entry_event(
+        event_logs.append(EventLog.log_entry_event(
             slot_id=slot.id,
-            license_plate=occupancy_data.license_plate
-        )
-        db.add(occupancy_log)
+            license_plate=occupancy_data.license_plate,
+            vehicle_type=occupancy_data.vehicle_type
+        ))
+        db.bulk_save_objects(event_logs)
         
         db.commit()
         db.refresh(slot)
@@ -184,13 +201,13 @@ async def occupy_slot(
 @router.post("/slot-occupancy/{slot_id}/vacate", response_model=SlotVacateResponse)
 async def vacate_slot(
     slot_id: int,
-    vacate_data: SlotVacateRequest,
-    db: Session = Depends(get_db)
+    vacate_data: SlotVacateRequest
 ):
     """
     Mark a slot as vacant (vehicle left).
     Optionally close the associated parking ticket.
     """
+    db = db_session()
     slot = db.query(Slot).filter(Slot.id == slot_id).first()
     if not slot:
         raise HTTPException(
@@ -234,6 +251,7 @@ async def vacate_slot(
         
         # Clear slot data
         previous_license = slot.license_plate
+        previous_vehicle_type = slot.vehicle_type
         slot.license_plate = None
         slot.vehicle_type = None
         slot.camera_detection = False
@@ -243,11 +261,12 @@ async def vacate_slot(
             slot.floor.occupied_slots -= 1
         
         # Log exit event
-        exit_log = EventLog.log_exit_event(
+        event_logs = [EventLog.log_exit_event(
             slot_id=slot.id,
-            license_plate=previous_license
-        )
-        db.add(exit_log)
+            license_plate=previous_license,
+            vehicle_type=previous_vehicle_type
+        )]
+        db.bulk_save_objects(event_logs)
         
         db.commit()
         db.refresh(slot)
@@ -270,13 +289,15 @@ async def vacate_slot(
 
 @router.get("/slot-occupancy/slot/{slot_number}", response_model=SlotResponse)
 async def get_slot_by_number(
+    request: Request,
+    response: Response,
     slot_number: str,
-    floor_number: Optional[int] = Query(None, description="Floor number to narrow search"),
-    db: Session = Depends(get_db)
+    floor_number: Optional[int] = Query(None, description="Floor number to narrow search")
 ):
     """
     Get slot information by slot number.
     """
+    db = db_session()
     query = db.query(Slot).filter(Slot.slot_number == slot_number)
     
     if floor_number is not None:
@@ -289,4 +310,8 @@ async def get_slot_by_number(
             detail=f"Slot {slot_number} not found"
         )
     
+    cached = apply_slots_etag(request, response, db)
+    if cached:
+        return cached
+    
     return slot
\ No newline at end of file
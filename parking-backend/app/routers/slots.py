@@ -1,27 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, status, Query, Request, Response
 from sqlalchemy import func
-from app.core.database import get_db
+from app.core.database import db_session
+from app.core.http_cache import apply_slots_etag, adapter_response
 from app.models.floor import Floor
 from app.models.slot import Slot, SlotStatus, SlotType
-from app.schemas.slot import SlotResponse, SlotUpdate
+from app.schemas.slot import SlotResponse, SlotUpdate, SlotPageResponse, SLOT_RESPONSE_ADAPTER
 from app.schemas.floor import FloorResponse
-from typing import List, Optional
+from typing import List, Optional, Union
 
 router = APIRouter(prefix="/api/v1", tags=["slots"])
 
-@router.get("/slots", response_model=List[SlotResponse])
+@router.get("/slots", response_model=Union[SlotPageResponse, List[SlotResponse]])
 async def get_slots(
+    request: Request,
+    response: Response,
     floor_id: Optional[int] = Query(None, description="Filter by floor ID"),
     status: Optional[str] = Query(None, description="Filter by slot status"),
     slot_type: Optional[str] = Query(None, description="Filter by slot type"),
+    after_id: Optional[int] = Query(None, description="Keyset cursor: return slots with id greater than this"),
     skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+    limit: int = Query(100, ge=1)
 ):
     """
     Get list of parking slots with optional filters.
+    
+    Passing after_id switches to keyset pagination and returns a page
+    envelope with next_cursor; skip/limit offset paging is kept otherwise.
     """
+    db = db_session()
+    cached = apply_slots_etag(request, response, db)
+    if cached:
+        return cached
+    
     query = db.query(Slot)
     
     if floor_id:
@@ -31,14 +41,25 @@ async def get_slots(
     if slot_type:
         query = query.filter(Slot.slot_type == slot_type)
     
+    if after_id is not None:
+        slots = query.filter(Slot.id > after_id).order_by(Slot.id).limit(limit).all()
+        next_cursor = slots[-1].id if len(slots) == limit else None
+        return SlotPageResponse(
+            items=[SlotResponse.from_orm_fast(slot) for slot in slots],
+            next_cursor=next_cursor
+        )
+    
     slots = query.offset(skip).limit(limit).all()
-    return slots
+    return adapter_response(
+        SLOT_RESPONSE_ADAPTER, [SlotResponse.from_orm_fast(slot) for slot in slots], response
+    )
 
 @router.get("/slots/{slot_id}", response_model=SlotResponse)
-async def get_slot(slot_id: int, db: Session = Depends(get_db)):
+async def get_slot(slot_id: int):
     """
     Get specific slot by ID.
     """
+    db = db_session()
     slot = db.query(Slot).filter(Slot.id == slot_id).first()
     if not slot:
         raise HTTPException(
@@ -50,12 +71,12 @@ async def get_slot(slot_id: int, db: Session = Depends(get_db)):
 @router.put("/slots/{slot_id}", response_model=SlotResponse)
 async def update_slot(
     slot_id: int,
-    slot_update: SlotUpdate,
-    db: Session = Depends(get_db)
+    slot_update: SlotUpdate
 ):
     """
     Update slot information.
     """
+    db = db_session()
     slot = db.query(Slot).filter(Slot.id == slot_id).first()
     if not slot:
         raise HTTPException(
@@ -70,7 +91,7 @@ async def update_slot(
         if slot_update.current_plate is not None:
             slot.current_plate = slot_update.current_plate
         
-        slot.last_updated = func.now()
+        slot.last_updated = func.now(6)
         
         db.commit()
         db.refresh(slot)
@@ -85,13 +106,19 @@ async def update_slot(
 
 @router.get("/slots/available", response_model=List[SlotResponse])
 async def get_available_slots(
+    request: Request,
+    response: Response,
     floor_id: Optional[int] = Query(None, description="Filter by floor ID"),
-    slot_type: Optional[str] = Query(None, description="Filter by slot type"),
-    db: Session = Depends(get_db)
+    slot_type: Optional[str] = Query(None, description="Filter by slot type")
 ):
     """
     Get list of available (free) parking slots.
     """
+    db = db_session()
+    cached = apply_slots_etag(request, response, db)
+    if cached:
+        return cached
+    
     query = db.query(Slot).filter(Slot.status == SlotStatus.FREE)
     
     if floor_id:
@@ -100,13 +127,16 @@ async def get_available_slots(
         query = query.filter(Slot.slot_type == slot_type)
     
     slots = query.all()
-    return slots
+    return adapter_response(
+        SLOT_RESPONSE_ADAPTER, [SlotResponse.from_orm_fast(slot) for slot in slots], response
+    )
 
 @router.get("/slots/floor/{floor_id}", response_model=List[SlotResponse])
-async def get_slots_by_floor(floor_id: int, db: Session = Depends(get_db)):
+async def get_slots_by_floor(floor_id: int, response: Response):
     """
     Get all slots on a specific floor.
     """
+    db = db_session()
     # Check if floor exists
     floor = db.query(Floor).filter(Floor.id == floor_id).first()
     if not floor:
@@ -116,13 +146,16 @@ async def get_slots_by_floor(floor_id: int, db: Session = Depends(get_db)):
         )
     
     slots = db.query(Slot).filter(Slot.floor_id == floor_id).all()
-    return slots
+    return adapter_response(
+        SLOT_RESPONSE_ADAPTER, [SlotResponse.from_orm_fast(slot) for slot in slots], response
+    )
 
 @router.get("/slots/search/{slot_code}", response_model=SlotResponse)
-async def get_slot_by_code(slot_code: str, db: Session = Depends(get_db)):
+async def get_slot_by_code(slot_code: str):
     """
     Get slot by its unique code.
     """
+    db = db_session()
     slot = db.query(Slot).filter(Slot.slot_code == slot_code).first()
     if not slot:
         raise HTTPException(
@@ -1,7 +1,7 @@
 # Pydantic schemas for API request/response validation
 from .ticket import TicketCreate, TicketResponse, TicketUpdate, TicketCloseRequest, TicketCloseResponse
 from .slot import (
-    SlotCreate, SlotResponse, SlotUpdate, SlotOccupancyRequest, 
+    SlotCreate, SlotResponse, SlotUpdate, SlotPageResponse, SlotOccupancyRequest, 
     SlotOccupancyResponse, SlotVacateRequest, SlotVacateResponse,
     FloorOccupancyResponse, ParkingOverviewResponse
 )
@@ -11,10 +11,10 @@ from .event_log import EventLogCreate, EventLogResponse, EventLogFilter
 
 __all__ = [
     "TicketCreate", "TicketResponse", "TicketUpdate", "TicketCloseRequest", "TicketCloseResponse",
-    "SlotCreate", "SlotResponse", "SlotUpdate", "SlotOccupancyRequest", 
+    "SlotCreate", "SlotResponse", "SlotUpdate", "SlotPageResponse", "SlotOccupancyRequest", 
     "SlotOccupancyResponse", "SlotVacateRequest", "SlotVacateResponse",
     "FloorOccupancyResponse", "ParkingOverviewResponse",
     "FloorCreate", "FloorResponse", "FloorUpdate", "FloorDetailResponse",
     "CameraCreate", "CameraResponse", "CameraUpdate",
     "EventLogCreate", "EventLogResponse", "EventLogFilter"
-]
\ No newline at end of file
+]
@@ -0,0 +1,35 @@
+from typing import Any
+
+# Rows loaded from our own database are already well-typed, so response
+# schemas built from them can skip field validation. Flip to False to fall
+# back to full model_validate() while debugging data issues.
+TRUST_DB_ROWS = True
+
+# Accepted license plate format for incoming requests. Passed as a Field
+# pattern so pydantic-core compiles it once and checks it natively. Keep it
+# off response schemas: rows stored before it existed may not match.
+LICENSE_PLATE_PATTERN = r"^[A-Z0-9\- ]{1,20}$"
+
+_MISSING = object()
+
+class ORMResponseMixin:
+    """Fast construction of response schemas from trusted ORM rows."""
+    
+    @classmethod
+    def from_orm_fast(cls, obj: Any):
+        """
+        Build the schema from an ORM object without running validation.
+        
+        Attributes are read by alias when one is set (e.g. plate_number),
+        and missing attributes fall back to the field default, mirroring
+        model_validate(from_attributes=True).
+        """
+        if not TRUST_DB_ROWS:
+            return cls.model_validate(obj)
+        
+        values = {}
+        for name, field in cls.model_fields.items():
+            value = getattr(obj, field.alias or name, _MISSING)
+            if value is not _MISSING:
+                values[name] = value
+        return cls.model_construct(**values)
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from .base import ORMResponseMixin
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 
 class CameraBase(BaseModel):
     camera_code: str = Field(..., min_length=1, max_length=30, description="Unique camera identifier")
@@ -22,7 +23,7 @@ class CameraUpdate(BaseModel):
     floor_id: Optional[int] = Field(None, description="Floor ID")
     is_active: Optional[bool] = Field(None, description="Whether camera is active")
 
-class CameraResponse(CameraBase):
+class CameraResponse(CameraBase, ORMResponseMixin):
     id: int
     floor_id: Optional[int] = None
     status: str
@@ -30,5 +31,7 @@ class CameraResponse(CameraBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="ignore")
+
+# Built once at import so list endpoints reuse the compiled serializer
+CAMERA_RESPONSE_ADAPTER = TypeAdapter(List[CameraResponse])
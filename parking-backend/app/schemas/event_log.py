@@ -1,6 +1,10 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+from .base import ORMResponseMixin, LICENSE_PLATE_PATTERN
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, Optional
+
+OptStr = Annotated[Optional[str], Field(None)]
+OptInt = Annotated[Optional[int], Field(None)]
 
 class EventLogBase(BaseModel):
     event_type: str = Field(..., description="Type of event (entry, exit, detection, error)")
@@ -9,33 +13,32 @@ class EventLogBase(BaseModel):
     severity: Optional[str] = Field("info", description="Severity level (info, warning, error, critical)")
 
 class EventLogCreate(EventLogBase):
-    slot_id: Optional[int] = Field(None, description="Related slot ID")
-    ticket_id: Optional[int] = Field(None, description="Related ticket ID")
-    camera_id: Optional[int] = Field(None, description="Related camera ID")
-    floor_id: Optional[int] = Field(None, description="Related floor ID")
-    license_plate: Optional[str] = Field(None, max_length=20, description="Vehicle license plate")
+    slot_id: OptInt
+    ticket_id: OptInt
+    camera_id: OptInt
+    floor_id: OptInt
+    license_plate: Optional[str] = Field(None, max_length=20, pattern=LICENSE_PLATE_PATTERN, description="Vehicle license plate")
     confidence_score: Optional[str] = Field(None, description="AI detection confidence score")
-    ip_address: Optional[str] = Field(None, description="IP address of the request")
-    user_agent: Optional[str] = Field(None, description="User agent string")
-    session_id: Optional[str] = Field(None, description="Session identifier")
+    ip_address: OptStr
+    user_agent: OptStr
+    session_id: OptStr
     metadata: Optional[str] = Field(None, description="Additional metadata as JSON string")
 
-class EventLogResponse(EventLogBase):
+class EventLogResponse(EventLogBase, ORMResponseMixin):
     id: int
-    slot_id: Optional[int] = None
-    ticket_id: Optional[int] = None
-    camera_id: Optional[int] = None
-    floor_id: Optional[int] = None
-    license_plate: Optional[str] = None
-    confidence_score: Optional[str] = None
-    ip_address: Optional[str] = None
-    user_agent: Optional[str] = None
-    session_id: Optional[str] = None
-    metadata: Optional[str] = None
+    slot_id: OptInt
+    ticket_id: OptInt
+    camera_id: OptInt
+    floor_id: OptInt
+    license_plate: OptStr
+    confidence_score: OptStr
+    ip_address: OptStr
+    user_agent: OptStr
+    session_id: OptStr
+    metadata: OptStr
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="ignore")
 
 class EventLogFilter(BaseModel):
     event_type: Optional[str] = Field(None, description="Filter by event type")
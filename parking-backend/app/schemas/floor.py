@@ -1,4 +1,5 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+from .base import ORMResponseMixin
 from datetime import datetime
 from typing import Optional, List
 
@@ -11,16 +12,22 @@ class FloorCreate(FloorBase):
 class FloorUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=10, description="Floor name/number")
 
-class FloorResponse(FloorBase):
+class FloorResponse(FloorBase, ORMResponseMixin):
     id: int
     created_at: datetime
     total_slots: Optional[int] = 0
     occupied_slots: Optional[int] = 0
     available_slots: Optional[int] = 0
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class FloorDetailResponse(FloorResponse):
     slots: List["SlotResponse"] = []
-    cameras: List["CameraResponse"] = []
\ No newline at end of file
+    cameras: List["CameraResponse"] = []
+
+# Resolve the forward refs once at import; imported here rather than at the
+# top so floor.py never depends on slot/camera while its own classes build
+from .slot import SlotResponse  # noqa: E402
+from .camera import CameraResponse  # noqa: E402
+
+FloorDetailResponse.model_rebuild()
@@ -1,4 +1,5 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from .base import ORMResponseMixin, LICENSE_PLATE_PATTERN
 from datetime import datetime
 from typing import Optional, List
 
@@ -14,17 +15,20 @@ class SlotUpdate(BaseModel):
     status: Optional[str] = Field(None, description="Slot status (FREE, OCCUPIED, RESERVED, DISABLED)")
     current_plate: Optional[str] = Field(None, max_length=20, description="License plate of current vehicle")
 
-class SlotResponse(SlotBase):
+class SlotResponse(SlotBase, ORMResponseMixin):
     id: int
     status: str
     current_plate: Optional[str] = None
     last_updated: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="ignore")
+
+class SlotPageResponse(BaseModel):
+    items: List[SlotResponse]
+    next_cursor: Optional[int] = Field(None, description="Pass as after_id to fetch the next page")
 
 class SlotOccupancyRequest(BaseModel):
-    license_plate: str = Field(..., min_length=1, max_length=20)
+    license_plate: str = Field(..., min_length=1, max_length=20, pattern=LICENSE_PLATE_PATTERN)
     vehicle_type: str = Field(..., description="Type of vehicle")
     entry_time: Optional[datetime] = Field(None, description="Entry time (defaults to now)")
 
@@ -59,4 +63,7 @@ class ParkingOverviewResponse(BaseModel):
     total_occupied: int
     total_available: int
     overall_occupancy_rate: float
-    floors: List[FloorOccupancyResponse]
\ No newline at end of file
+    floors: List[FloorOccupancyResponse]
+
+# Built once at import so list endpoints reuse the compiled serializer
+SLOT_RESPONSE_ADAPTER = TypeAdapter(List[SlotResponse])
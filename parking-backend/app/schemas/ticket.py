@@ -1,30 +1,36 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from .base import ORMResponseMixin, LICENSE_PLATE_PATTERN
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 
 class TicketBase(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+    
     license_plate: str = Field(..., min_length=1, max_length=20, description="Vehicle license plate", alias="plate_number")
     vehicle_type: str = Field(..., description="Type of vehicle (CAR, BIKE)")
 
 class TicketCreate(TicketBase):
+    # Format is only enforced on input; responses echo stored plates as-is
+    license_plate: str = Field(..., min_length=1, max_length=20, pattern=LICENSE_PLATE_PATTERN, description="Vehicle license plate", alias="plate_number")
     slot_id: int = Field(..., description="ID of the parking slot")
 
 class TicketUpdate(BaseModel):
     status: Optional[str] = Field(None, description="Ticket status")
 
-class TicketResponse(TicketBase):
+class TicketResponse(TicketBase, ORMResponseMixin):
     id: int
     slot_id: int
     entry_time: datetime
     exit_time: Optional[datetime] = None
     status: str
     
-    class Config:
-        from_attributes = True
-        populate_by_name = True
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True, frozen=True, extra="ignore")
 
 class TicketCloseRequest(BaseModel):
     exit_time: Optional[datetime] = Field(None, description="Exit time (defaults to now)")
 
 class TicketCloseResponse(TicketResponse):
-    parking_duration_minutes: Optional[int] = None
\ No newline at end of file
+    parking_duration_minutes: Optional[int] = None
+
+# Built once at import so list endpoints reuse the compiled serializer
+TICKET_RESPONSE_ADAPTER = TypeAdapter(List[TicketResponse])
@@ -1,41 +1,167 @@
 """
 Backend API client for communication with parking management system.
 """
-import requests
-from typing import Dict, Optional, List
+import asyncio
+import gzip
+import hashlib
+import hmac
+import httpx
+import orjson
+from cachetools import TTLCache
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Optional, List
 import logging
+import queue
+import threading
+import time
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# orjson.JSONDecodeError is a ValueError, not an httpx error, so both are
+# handled together
+REQUEST_ERRORS = (httpx.HTTPError, orjson.JSONDecodeError)
+
+# Gateway errors retried with exponential backoff before giving up
+RETRY_STATUSES = frozenset({502, 503, 504})
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.2
+
+
+def _decode(response: httpx.Response) -> Dict:
+    """Decode a JSON response body; an empty body decodes to {}."""
+    return orjson.loads(response.content) if response.content else {}
+
 
 class BackendClient:
-    """Client for communicating with the backend parking management API."""
+    """
+    Client for communicating with the backend parking management API.
+    
+    Requests run as coroutines on one pooled httpx.AsyncClient driven by a
+    background event loop, so independent calls (e.g. a flush of queued
+    status updates) go out concurrently instead of one after another.
+    HTTP/2 multiplexing is used when the backend negotiates it over TLS;
+    plain http falls back to the pooled HTTP/1.1 keep-alive connections.
+    
+    The *_async methods are coroutines for use with submit() or from code
+    already on the client's loop; the same-named methods without the
+    suffix block until the call completes, for the synchronous CV loops.
+    """
+    
+    STATUS_QUEUE_SIZE = 256
+    VEHICLE_CACHE_SIZE = 4096
+    VEHICLE_CACHE_TTL = 30
     
-    def __init__(self, base_url: str, api_key: str = ""):
+    def __init__(self, base_url: str, api_key: str = "",
+                 flush_interval_ms: int = 200, batch_size: int = 32,
+                 on_flush_error: Optional[Callable[[Dict, Exception], None]] = None,
+                 internal_secret: str = "", max_connections: int = 64):
         """
         Initialize the backend client.
         
         Args:
             base_url: Base URL of the backend API
             api_key: API key for authentication
+            flush_interval_ms: How often queued status updates are sent
+            batch_size: Maximum status updates sent per flush pass
+            on_flush_error: Called on the client's event loop thread with
+                each queued status update that could not be delivered and
+                the error
+            internal_secret: Shared HMAC secret; when set, entries are posted
+                signed to the backend's /api/internal/entries endpoint
+            max_connections: Maximum pooled connections to the backend
         """
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
-        self.session = requests.Session()
+        self.internal_secret = internal_secret
         
-        # Set default headers
+        headers = {'Content-Type': 'application/json'}
         if self.api_key:
-            self.session.headers.update({
-                'Authorization': f'Bearer {self.api_key}'
-            })
-        self.session.headers.update({
-            'Content-Type': 'application/json'
-        })
+            headers['Authorization'] = f'Bearer {self.api_key}'
+        
+        # Connection failures are retried by the transport; gateway errors
+        # by _request()
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=True,
+            timeout=10,
+            headers=headers,
+            limits=httpx.Limits(max_connections=max_connections),
+            transport=httpx.AsyncHTTPTransport(http2=True, retries=MAX_RETRIES)
+        )
+        
+        # Recent vehicle lookups, so a parked car re-detected every frame
+        # does not hit the backend each time
+        self._vehicle_cache = TTLCache(maxsize=self.VEHICLE_CACHE_SIZE, ttl=self.VEHICLE_CACHE_TTL)
+        
+        # Parking status updates are queued and sent in concurrent passes
+        # by a task on the client's loop so the video loop never waits on
+        # the network
+        self.flush_interval = flush_interval_ms / 1000
+        self.batch_size = batch_size
+        self._status_queue = queue.Queue(maxsize=self.STATUS_QUEUE_SIZE)
+        self.on_flush_error = on_flush_error
+        self.failed_status_updates = 0
+        self.last_status_error: Optional[Exception] = None
+        self._unreported_failures = 0
+        self._failure_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        
+        # The loop is started here rather than on first use, so concurrent
+        # first calls cannot each start their own
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(
+            target=self._loop.run_forever, name="backend-client-loop", daemon=True
+        )
+        self._loop_thread.start()
+        self._flusher = self.submit(self._flush_loop())
+    
+    def submit(self, coro: Awaitable) -> Future:
+        """
+        Schedule a client coroutine from synchronous code.
+        
+        Args:
+            coro: Coroutine returned by one of the *_async methods
+        
+        Returns:
+            Future resolving to the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+    
+    def _run(self, coro: Awaitable):
+        """Run a client coroutine on the loop and wait for its result."""
+        return self.submit(coro).result()
+    
+    async def _request(self, method: str, path: str, body: Optional[bytes] = None,
+                       headers: Optional[Dict[str, str]] = None,
+                       timeout: Optional[float] = None) -> Dict:
+        """
+        Send a request, retrying gateway errors, and decode the JSON reply.
+        
+        Args:
+            method: HTTP method
+            path: Path relative to the backend base URL
+            body: Encoded request body (optional)
+            headers: Extra request headers (optional)
+            timeout: Override of the client timeout in seconds (optional)
+        
+        Returns:
+            Decoded response body
+        """
+        extra = {} if timeout is None else {'timeout': timeout}
+        
+        for attempt in range(MAX_RETRIES + 1):
+            response = await self.client.request(method, path, content=body, headers=headers, **extra)
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                break
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+        
+        response.raise_for_status()
+        return _decode(response)
     
-    def register_entry(self, plate_number: str, vehicle_type: str,
-                      timestamp: str, confidence: float,
-                      image_data: Optional[str] = None) -> Dict:
+    async def register_entry_async(self, plate_number: str, vehicle_type: str,
+                                   timestamp: str, confidence: float,
+                                   image_data: Optional[str] = None) -> Dict:
         """
         Register a vehicle entry.
         
@@ -43,39 +169,71 @@ class BackendClient:
             plate_number: License plate number
             vehicle_type: Type of vehicle (car, motorcycle, etc.)
             timestamp: Entry timestamp (ISO format)
-            confidence: Detection confidence score
+            confidence: Detection confidence score in [0, 1]; sent rounded to two decimals
             image_data: Base64 encoded image (optional)
-            
+        
         Returns:
             API response dict
         """
-        endpoint = f"{self.base_url}/api/entries"
-        
         payload = {
             'plate_number': plate_number,
             'vehicle_type': vehicle_type,
             'timestamp': timestamp,
-            'confidence': confidence
+            'confidence': round(float(confidence), 2)
         }
         
         if image_data:
             payload['image'] = image_data
         
+        body = orjson.dumps(payload)
+        headers = {}
+        if self.internal_secret:
+            path = "/api/internal/entries"
+            # Signed over the JSON the backend sees after decompression
+            headers.update(self._sign(body))
+        else:
+            path = "/api/entries"
+        
+        if image_data:
+            # Image payloads dominate upload time; a fast gzip pass shrinks
+            # them well before they hit the network. The backend's
+            # GzipRequestMiddleware decompresses them.
+            body = gzip.compress(body, compresslevel=1)
+            headers['Content-Encoding'] = 'gzip'
+        
         try:
             logger.info(f"Registering entry for plate: {plate_number}")
-            response = self.session.post(endpoint, json=payload, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            self.invalidate(plate_number)
+            data = await self._request("POST", path, body, headers)
             logger.info(f"Entry registered successfully: {data}")
             return data
-            
-        except requests.exceptions.RequestException as e:
+        
+        except REQUEST_ERRORS as e:
             logger.error(f"Failed to register entry: {e}")
             raise
     
-    def register_exit(self, plate_number: str, timestamp: str,
-                     duration: Optional[int] = None) -> Dict:
+    def register_entry(self, *args, **kwargs) -> Dict:
+        """Blocking form of register_entry_async()."""
+        return self._run(self.register_entry_async(*args, **kwargs))
+    
+    def _sign(self, body: bytes) -> Dict[str, str]:
+        """
+        Build the X-Timestamp/X-Signature headers for an internal API call.
+        
+        Args:
+            body: Exact request body bytes that will be sent
+        
+        Returns:
+            Headers carrying the signing time and HMAC-SHA256 of "<time>.<body>"
+        """
+        timestamp = str(int(time.time()))
+        signature = hmac.new(
+            self.internal_secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256
+        ).hexdigest()
+        return {'X-Timestamp': timestamp, 'X-Signature': signature}
+    
+    async def register_exit_async(self, plate_number: str, timestamp: str,
+                                  duration: Optional[int] = None) -> Dict:
         """
         Register a vehicle exit.
         
@@ -83,12 +241,10 @@ class BackendClient:
             plate_number: License plate number
             timestamp: Exit timestamp (ISO format)
             duration: Parking duration in minutes (optional)
-            
+        
         Returns:
             API response dict
         """
-        endpoint = f"{self.base_url}/api/exits"
-        
         payload = {
             'plate_number': plate_number,
             'timestamp': timestamp
@@ -99,34 +255,39 @@ class BackendClient:
         
         try:
             logger.info(f"Registering exit for plate: {plate_number}")
-            response = self.session.post(endpoint, json=payload, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            self.invalidate(plate_number)
+            data = await self._request("POST", "/api/exits", orjson.dumps(payload))
             logger.info(f"Exit registered successfully: {data}")
             return data
-            
-        except requests.exceptions.RequestException as e:
+        
+        except REQUEST_ERRORS as e:
             logger.error(f"Failed to register exit: {e}")
             raise
     
+    def register_exit(self, *args, **kwargs) -> Dict:
+        """Blocking form of register_exit_async()."""
+        return self._run(self.register_exit_async(*args, **kwargs))
+    
     def update_parking_status(self, total_spots: int, occupied_spots: int,
                              available_spots: int,
                              changes: Optional[List[Dict]] = None) -> Dict:
         """
         Update parking spot occupancy status.
         
+        The update is queued and sent by the background flusher; if the
+        queue is full it is posted immediately instead.
+        
         Args:
             total_spots: Total number of parking spots
             occupied_spots: Number of occupied spots
             available_spots: Number of available spots
             changes: List of spot state changes (optional)
-            
+        
         Returns:
-            API response dict
+            API response dict, or {'queued': True, 'failed_updates': n} when
+            queued, where n counts queued updates that failed to send since
+            the previous call (see last_status_error for the cause)
         """
-        endpoint = f"{self.base_url}/api/parking-status"
-        
         payload = {
             'total_spots': total_spots,
             'occupied_spots': occupied_spots,
@@ -138,85 +299,179 @@ class BackendClient:
             payload['changes'] = changes
         
         try:
-            logger.info(f"Updating parking status: {occupied_spots}/{total_spots} occupied")
-            response = self.session.post(endpoint, json=payload, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            self._status_queue.put_nowait(payload)
+            logger.debug(f"Queued parking status: {occupied_spots}/{total_spots} occupied")
+            with self._failure_lock:
+                failed, self._unreported_failures = self._unreported_failures, 0
+            return {'queued': True, 'failed_updates': failed}
+        except queue.Full:
+            logger.warning("Parking status queue full, sending update directly")
+            return self._run(self._post_parking_status(payload))
+    
+    async def _post_parking_status(self, payload: Dict) -> Dict:
+        """Send a single parking status update."""
+        try:
+            logger.info(
+                f"Updating parking status: {payload['occupied_spots']}/{payload['total_spots']} occupied"
+            )
+            data = await self._request("POST", "/api/parking-status", orjson.dumps(payload))
             logger.debug(f"Parking status updated successfully: {data}")
             return data
-            
-        except requests.exceptions.RequestException as e:
+        
+        except REQUEST_ERRORS as e:
             logger.error(f"Failed to update parking status: {e}")
             raise
     
-    def get_vehicle_info(self, plate_number: str) -> Optional[Dict]:
+    async def _send_status_updates(self, batch: List[Dict]):
+        """Post queued parking status updates concurrently, recording any that fail."""
+        results = await asyncio.gather(
+            *(self._post_parking_status(payload) for payload in batch), return_exceptions=True
+        )
+        for payload, result in zip(batch, results):
+            if isinstance(result, Exception):
+                self._record_status_failure(payload, result)
+    
+    def _record_status_failure(self, payload: Dict, error: Exception):
+        """Count an undeliverable status update and hand it to on_flush_error."""
+        with self._failure_lock:
+            self.failed_status_updates += 1
+            self._unreported_failures += 1
+            self.last_status_error = error
+        
+        if self.on_flush_error is not None:
+            try:
+                self.on_flush_error(payload, error)
+            except Exception as e:
+                logger.error(f"on_flush_error callback failed: {e}")
+    
+    async def _flush_loop(self):
+        """Background task that periodically flushes queued status updates."""
+        while not self._stop_event.is_set():
+            await asyncio.sleep(self.flush_interval)
+            await self.flush_async()
+        await self.flush_async()
+    
+    async def flush_async(self):
+        """
+        Send all queued parking status updates.
+        
+        Never raises: an unexpected error while sending a batch is recorded
+        against that batch's updates so the flusher task keeps running.
+        """
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._status_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            if not batch:
+                return
+            
+            try:
+                await self._send_status_updates(batch)
+            except Exception as e:
+                logger.exception(f"Unexpected error sending {len(batch)} parking status updates")
+                for payload in batch:
+                    self._record_status_failure(payload, e)
+    
+    def flush(self):
+        """Blocking form of flush_async()."""
+        self._run(self.flush_async())
+    
+    def close(self):
+        """Stop the background flusher after sending pending updates."""
+        self._stop_event.set()
+        try:
+            self._flusher.result(timeout=10)
+        except Exception as e:
+            logger.error(f"Parking status flusher did not finish cleanly: {e}")
+        self._run(self.client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join(timeout=10)
+    
+    async def get_vehicle_info_async(self, plate_number: str) -> Optional[Dict]:
         """
         Get vehicle information by plate number.
         
         Args:
             plate_number: License plate number
-            
+        
         Returns:
             Vehicle info dict or None if not found
         """
-        endpoint = f"{self.base_url}/api/vehicles/{plate_number}"
+        cached = self._vehicle_cache.get(plate_number)
+        if cached is not None:
+            logger.debug(f"Vehicle info cache hit for plate: {plate_number}")
+            return cached
         
         try:
             logger.info(f"Fetching vehicle info for plate: {plate_number}")
-            response = self.session.get(endpoint, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = await self._request("GET", f"/api/vehicles/{plate_number}")
             logger.info(f"Vehicle info retrieved: {data}")
+            self._vehicle_cache[plate_number] = data
             return data
-            
-        except requests.exceptions.HTTPError as e:
+        
+        except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 logger.info(f"Vehicle not found: {plate_number}")
                 return None
             logger.error(f"Failed to get vehicle info: {e}")
             raise
-        except requests.exceptions.RequestException as e:
+        except REQUEST_ERRORS as e:
             logger.error(f"Failed to get vehicle info: {e}")
             raise
     
-    def get_parking_availability(self) -> Dict:
+    def get_vehicle_info(self, plate_number: str) -> Optional[Dict]:
+        """Blocking form of get_vehicle_info_async()."""
+        return self._run(self.get_vehicle_info_async(plate_number))
+    
+    def invalidate(self, plate_number: str):
+        """
+        Drop any cached vehicle info for a plate.
+        
+        Args:
+            plate_number: License plate number
+        """
+        self._vehicle_cache.pop(plate_number, None)
+    
+    async def get_parking_availability_async(self) -> Dict:
         """
         Get current parking availability.
         
         Returns:
             Availability info dict
         """
-        endpoint = f"{self.base_url}/api/parking-status"
-        
         try:
             logger.debug("Fetching parking availability")
-            response = self.session.get(endpoint, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = await self._request("GET", "/api/parking-status")
             logger.debug(f"Parking availability: {data}")
             return data
-            
-        except requests.exceptions.RequestException as e:
+        
+        except REQUEST_ERRORS as e:
             logger.error(f"Failed to get parking availability: {e}")
             raise
     
-    def health_check(self) -> bool:
+    def get_parking_availability(self) -> Dict:
+        """Blocking form of get_parking_availability_async()."""
+        return self._run(self.get_parking_availability_async())
+    
+    async def health_check_async(self) -> bool:
         """
         Check if backend API is healthy.
         
         Returns:
             True if healthy, False otherwise
         """
-        endpoint = f"{self.base_url}/api/health"
-        
         try:
-            response = self.session.get(endpoint, timeout=5)
-            response.raise_for_status()
+            await self._request("GET", "/api/health", timeout=5)
             logger.info("Backend health check: OK")
             return True
-        except requests.exceptions.RequestException as e:
+        except REQUEST_ERRORS as e:
             logger.warning(f"Backend health check failed: {e}")
             return False
+    
+    def health_check(self) -> bool:
+        """Blocking form of health_check_async()."""
+        return self._run(self.health_check_async())
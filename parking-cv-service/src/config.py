@@ -1,45 +1,62 @@
 """
 Configuration module for parking CV service.
 """
-import os
-from dotenv import load_dotenv
+from typing import List, Optional
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
-load_dotenv()
 
-
-class Config:
-    """Configuration settings for the parking CV service."""
+class Settings(BaseSettings):
+    """
+    Configuration settings for the parking CV service.
+    
+    Values are read once from the environment (or .env) and validated on
+    construction; the resulting instance is frozen.
+    """
+    model_config = SettingsConfigDict(env_file=".env", frozen=True, extra="ignore")
     
     # Backend API settings
-    BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
-    API_KEY = os.getenv("API_KEY", "")
+    backend_url: str = "http://localhost:8000"
+    api_key: str = ""
+    internal_api_secret: str = ""
     
     # Model paths
-    VEHICLE_MODEL_PATH = os.getenv("VEHICLE_MODEL_PATH", "models/vehicle_yolov8n.pt")
-    PLATE_MODEL_PATH = os.getenv("PLATE_MODEL_PATH", "models/plate_yolov8n.pt")
+    vehicle_model_path: str = "models/vehicle_yolov8n.pt"
+    vehicle_engine_path: str = "models/vehicle_yolov8n.engine"
+    shared_detector: bool = False  # batch across pipelines in one process
+    plate_model_path: str = "models/plate_yolov8n.pt"
+    plate_roi_from_tensor: bool = False  # only for sources of 640 px or less
     
     # Detection settings
-    VEHICLE_CONFIDENCE_THRESHOLD = float(os.getenv("VEHICLE_CONFIDENCE_THRESHOLD", "0.5"))
-    PLATE_CONFIDENCE_THRESHOLD = float(os.getenv("PLATE_CONFIDENCE_THRESHOLD", "0.6"))
+    vehicle_confidence_threshold: float = 0.5
+    plate_confidence_threshold: float = 0.6
     
     # OCR settings
-    OCR_LANGUAGES = ["en"]
-    OCR_CONFIDENCE_THRESHOLD = float(os.getenv("OCR_CONFIDENCE_THRESHOLD", "0.7"))
+    ocr_languages: List[str] = ["en"]
+    ocr_confidence_threshold: float = 0.7
+    # Only matters on the CPU fallback, and only when set to false:
+    # EasyOCR already quantizes its CPU models by default, so false turns
+    # that off (e.g. to compare accuracy). None and true both keep it on.
+    ocr_cpu_quantize: Optional[bool] = None
     
     # Camera settings
-    ENTRY_CAMERA_URL = os.getenv("ENTRY_CAMERA_URL", "0")
-    INDOOR_CAMERA_URL = os.getenv("INDOOR_CAMERA_URL", "1")
+    entry_camera_url: str = "0"
+    indoor_camera_url: str = "1"
     
     # Processing settings
-    FRAME_SKIP = int(os.getenv("FRAME_SKIP", "5"))
-    MAX_RETRY_ATTEMPTS = int(os.getenv("MAX_RETRY_ATTEMPTS", "3"))
+    frame_skip: int = 5
+    max_retry_attempts: int = 3
     
     # Logging
-    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    log_level: str = "INFO"
     
+    @field_validator("backend_url")
     @classmethod
-    def validate(cls):
+    def _require_backend_url(cls, value: str) -> str:
         """Validate configuration settings."""
-        if not cls.BACKEND_URL:
+        if not value:
             raise ValueError("BACKEND_URL is required")
-        return True
+        return value
+
+
+settings = Settings()
@@ -5,9 +5,6 @@ import logging
 import argparse
 import sys
 
-from config import Config
-from pipelines.entry_pipeline import EntryPipeline
-
 
 def setup_logging(level: str = "INFO"):
     """Setup logging configuration."""
@@ -16,7 +13,7 @@ def setup_logging(level: str = "INFO"):
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         handlers=[
             logging.StreamHandler(sys.stdout),
-            logging.FileHandler('entry_pipeline.log')
+            logging.FileHandler('entry_pipeline.log', delay=True)
         ]
     )
 
@@ -34,6 +31,11 @@ def main():
     
     args = parser.parse_args()
     
+    # Heavy imports (ultralytics, torch, cv2) are deferred until the
+    # arguments are valid so --help and usage errors return immediately
+    from config import settings
+    from pipelines.entry_pipeline import EntryPipeline
+    
     # Setup logging
     setup_logging(args.log_level)
     logger = logging.getLogger(__name__)
@@ -41,12 +43,8 @@ def main():
     logger.info("Starting Parking Entry Monitoring Service")
     
     try:
-        # Load and validate configuration
-        Config.validate()
-        logger.info("Configuration validated successfully")
-        
         # Initialize pipeline
-        pipeline = EntryPipeline(Config)
+        pipeline = EntryPipeline(settings)
         
         # Run pipeline
         pipeline.run(
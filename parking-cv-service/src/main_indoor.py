@@ -6,7 +6,7 @@ import argparse
 import sys
 import json
 
-from config import Config
+from config import settings
 from pipelines.indoor_pipeline import IndoorPipeline
 
 
@@ -66,10 +66,6 @@ def main():
     logger.info("Starting Indoor Parking Monitoring Service")
     
     try:
-        # Load and validate configuration
-        Config.validate()
-        logger.info("Configuration validated successfully")
-        
         # Load parking spots configuration
         parking_spots = load_parking_spots(args.spots_config)
         if parking_spots:
@@ -78,7 +74,7 @@ def main():
             logger.warning("No parking spots configured")
         
         # Initialize pipeline
-        pipeline = IndoorPipeline(Config, parking_spots=parking_spots)
+        pipeline = IndoorPipeline(settings, parking_spots=parking_spots)
         
         # Run pipeline
         pipeline.run(
@@ -1,8 +1,17 @@
 """
 Models package for vehicle and plate detection.
 """
+import torch
+
+# Let FP32 matmuls/convolutions use TF32 tensor cores and let cuDNN pick the
+# fastest kernels for our fixed input sizes
+torch.set_float32_matmul_precision('high')
+torch.backends.cudnn.benchmark = True
+
 from .vehicle_detector import VehicleDetector
 from .plate_detector import PlateDetector
 from .plate_ocr import PlateOCR
+from .shared_detector import SharedDetector
+from ._registry import get_vehicle_detector
 
-__all__ = ["VehicleDetector", "PlateDetector", "PlateOCR"]
+__all__ = ["VehicleDetector", "PlateDetector", "PlateOCR", "SharedDetector", "get_vehicle_detector"]
@@ -0,0 +1,38 @@
+"""
+Process-wide registry of loaded models.
+"""
+from functools import lru_cache
+from typing import Optional
+import threading
+
+from .vehicle_detector import VehicleDetector
+
+# Guards first-time construction so two pipelines starting together
+# don't both load the weights
+_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _load_vehicle_detector(model_path: str, confidence_threshold: float,
+                           engine_path: Optional[str]) -> VehicleDetector:
+    return VehicleDetector(model_path, confidence_threshold, engine_path=engine_path)
+
+
+def get_vehicle_detector(model_path: str, confidence_threshold: float,
+                         engine_path: Optional[str] = None) -> VehicleDetector:
+    """
+    Get the vehicle detector for a model, loading it on first use.
+    
+    Pipelines running in the same process share one instance per model
+    instead of each loading the YOLO weights into VRAM.
+    
+    Args:
+        model_path: Path to YOLO model weights
+        confidence_threshold: Minimum confidence for detections
+        engine_path: Optional exported TensorRT engine, preferred when present
+        
+    Returns:
+        Shared vehicle detector
+    """
+    with _lock:
+        return _load_vehicle_detector(model_path, confidence_threshold, engine_path)
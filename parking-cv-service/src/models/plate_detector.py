@@ -1,41 +1,101 @@
 """
 License plate detection module using YOLOv8.
 """
+import os
 import cv2
 import numpy as np
+import torch
+import torch.nn.functional as F
 from ultralytics import YOLO
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import logging
 
+from .vehicle_detector import STRIDE, PAD_VALUE
+
 logger = logging.getLogger(__name__)
 
+# Frame-diff gate: frames are compared at this size, and a mean absolute
+# grayscale difference below the threshold counts as "scene unchanged"
+MOTION_GATE_SIZE = (160, 90)
+MOTION_GATE_THRESHOLD = 2.0
+
+# Exported formats preferred over PyTorch weights, fastest first
+EXPORTED_MODEL_SUFFIXES = ('.engine', '.onnx')
+
 
 class PlateDetector:
     """Detects license plates in images using YOLOv8."""
     
-    def __init__(self, model_path: str, confidence_threshold: float = 0.6):
+    def __init__(self, model_path: str, confidence_threshold: float = 0.6,
+                 roi_from_tensor: bool = False):
         """
         Initialize the plate detector.
         
         Args:
             model_path: Path to the YOLOv8 model weights
             confidence_threshold: Minimum confidence score for detections
+            roi_from_tensor: Let detect_in_roi slice the vehicle ROI from the
+                shared letterboxed frame tensor instead of cropping the
+                native-resolution frame. Only for sources whose long side is
+                at most INFERENCE_SIZE (640 px); larger frames always use the
+                native crop, since the downscaled tensor loses small plates
         """
         self.model_path = model_path
         self.confidence_threshold = confidence_threshold
+        self.roi_from_tensor = roi_from_tensor
         self.model = None
+        self.half = torch.cuda.is_available()  # FP16 inference on GPU
+        self._prev_gray = None
         self._load_model()
     
+    def _resolve_model_path(self) -> str:
+        """
+        Prefer a quantized TensorRT/ONNX export sitting next to the .pt weights.
+        
+        Returns:
+            Path of the model artifact to load
+        """
+        stem, ext = os.path.splitext(self.model_path)
+        if ext != '.pt':
+            return self.model_path
+        
+        for suffix in EXPORTED_MODEL_SUFFIXES:
+            candidate = stem + suffix
+            if os.path.exists(candidate):
+                return candidate
+        
+        return self.model_path
+    
     def _load_model(self):
         """Load the YOLOv8 model."""
         try:
+            self.model_path = self._resolve_model_path()
             logger.info(f"Loading plate detection model from {self.model_path}")
-            self.model = YOLO(self.model_path)
+            self.model = YOLO(self.model_path, task='detect')
             logger.info("Plate detection model loaded successfully")
         except Exception as e:
             logger.error(f"Failed to load plate detection model: {e}")
             raise
     
+    def should_run(self, frame: np.ndarray) -> bool:
+        """
+        Check whether the scene changed enough to be worth running detection.
+        
+        Args:
+            frame: Current frame (BGR format)
+            
+        Returns:
+            False if the frame is visually identical to the last accepted one
+        """
+        small = cv2.resize(frame, MOTION_GATE_SIZE, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        
+        if self._prev_gray is not None and cv2.absdiff(self._prev_gray, gray).mean() < MOTION_GATE_THRESHOLD:
+            return False
+        
+        self._prev_gray = gray
+        return True
+    
     def detect(self, image: np.ndarray) -> List[dict]:
         """
         Detect license plates in an image.
@@ -50,19 +110,11 @@ class PlateDetector:
             raise RuntimeError("Model not loaded")
         
         try:
-            results = self.model(image, conf=self.confidence_threshold, verbose=False)
+            results = self.model(image, conf=self.confidence_threshold, half=self.half, verbose=False)
             detections = []
             
             for result in results:
-                boxes = result.boxes
-                for box in boxes:
-                    x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                    confidence = float(box.conf[0])
-                    
-                    detections.append({
-                        'bbox': [int(x1), int(y1), int(x2), int(y2)],
-                        'confidence': confidence
-                    })
+                detections.extend(self._result_to_detections(result))
             
             logger.debug(f"Detected {len(detections)} license plates")
             return detections
@@ -71,17 +123,53 @@ class PlateDetector:
             logger.error(f"Error during plate detection: {e}")
             return []
     
-    def detect_in_roi(self, image: np.ndarray, roi_bbox: List[int]) -> List[dict]:
+    @staticmethod
+    def _result_to_detections(result, scale: float = 1.0,
+                              offset: Tuple[int, int] = (0, 0)) -> List[dict]:
+        """
+        Convert one Ultralytics result into detection dicts.
+        
+        Args:
+            result: Single Ultralytics Results object
+            scale: Factor the input was resized by before inference
+            offset: (x, y) of the input's origin in the resized image
+            
+        Returns:
+            List of detections, each containing bbox and confidence
+        """
+        # One device-to-host transfer per result rather than per box
+        xyxy = result.boxes.xyxy.cpu().numpy()
+        conf = result.boxes.conf.cpu().numpy()
+        
+        if scale != 1.0 or offset != (0, 0):
+            xyxy = (xyxy + np.array(offset * 2, dtype=np.float32)) / scale
+        xyxy = xyxy.astype(np.int32)
+        
+        return [
+            {'bbox': bbox, 'confidence': confidence}
+            for bbox, confidence in zip(xyxy.tolist(), conf.tolist())
+        ]
+    
+    def detect_in_roi(self, image: np.ndarray, roi_bbox: List[int],
+                      preprocessed: Optional[Tuple[torch.Tensor, float]] = None) -> List[dict]:
         """
         Detect license plates within a region of interest.
         
         Args:
             image: Full image
             roi_bbox: Bounding box of region of interest [x1, y1, x2, y2]
+            preprocessed: Letterboxed frame tensor and scale from
+                VehicleDetector.preprocess(); with roi_from_tensor set and a
+                frame that was not downscaled, the ROI is sliced from it
+                instead of re-preprocessing the BGR crop
             
         Returns:
             List of plate detections with adjusted coordinates
         """
+        if (self.roi_from_tensor and preprocessed is not None
+                and preprocessed[1] >= 1.0 and self.model_path.endswith('.pt')):
+            return self._detect_in_tensor_roi(preprocessed, roi_bbox)
+        
         x1, y1, x2, y2 = roi_bbox
         roi = image[y1:y2, x1:x2]
         
@@ -96,6 +184,40 @@ class PlateDetector:
         
         return detections
     
+    def _detect_in_tensor_roi(self, preprocessed: Tuple[torch.Tensor, float],
+                              roi_bbox: List[int]) -> List[dict]:
+        """
+        Detect license plates in an ROI sliced from a letterboxed frame tensor.
+        
+        Args:
+            preprocessed: Letterboxed frame tensor and its resize scale
+            roi_bbox: Bounding box of region of interest in frame coordinates
+            
+        Returns:
+            List of plate detections in frame coordinates
+        """
+        tensor, scale = preprocessed
+        x1, y1, x2, y2 = (int(round(v * scale)) for v in roi_bbox)
+        
+        # Tensor inputs skip Ultralytics' letterbox, so pad to the stride here
+        roi = tensor[:, :, y1:y2, x1:x2]
+        h, w = roi.shape[2:]
+        roi = F.pad(roi, (0, -w % STRIDE, 0, -h % STRIDE), value=PAD_VALUE)
+        
+        try:
+            results = self.model(roi, conf=self.confidence_threshold, half=self.half, verbose=False)
+            detections = []
+            
+            for result in results:
+                detections.extend(self._result_to_detections(result, scale, (x1, y1)))
+            
+            logger.debug(f"Detected {len(detections)} license plates")
+            return detections
+            
+        except Exception as e:
+            logger.error(f"Error during plate detection: {e}")
+            return []
+    
     def get_best_plate(self, detections: List[dict]) -> Optional[dict]:
         """
         Get the plate with highest confidence.
@@ -109,8 +231,10 @@ class PlateDetector:
         if not detections:
             return None
         
-        best = max(detections, key=lambda d: d['confidence'])
-        return best
+        confidences = np.fromiter(
+            (d['confidence'] for d in detections), dtype=np.float32, count=len(detections)
+        )
+        return detections[int(confidences.argmax())]
     
     def crop_plate(self, image: np.ndarray, bbox: List[int], 
                    padding: int = 5) -> np.ndarray:
@@ -136,18 +260,20 @@ class PlateDetector:
         
         return image[y1:y2, x1:x2]
     
-    def draw_detections(self, image: np.ndarray, detections: List[dict]) -> np.ndarray:
+    def draw_detections(self, image: np.ndarray, detections: List[dict], *,
+                        inplace: bool = False) -> np.ndarray:
         """
         Draw bounding boxes on image.
         
         Args:
             image: Input image
             detections: List of detections
+            inplace: Draw directly on image instead of a copy
             
         Returns:
             Image with drawn bounding boxes
         """
-        img_copy = image.copy()
+        img_copy = image if inplace else image.copy()
         
         for det in detections:
             x1, y1, x2, y2 = det['bbox']
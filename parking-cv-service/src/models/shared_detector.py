@@ -0,0 +1,132 @@
+"""
+Cross-pipeline batching of vehicle detection.
+"""
+import numpy as np
+from concurrent.futures import Future
+from typing import List
+import logging
+import queue
+import threading
+import time
+
+from .vehicle_detector import VehicleDetector, INFERENCE_SIZE
+from ._registry import get_vehicle_detector
+
+logger = logging.getLogger(__name__)
+
+# Frames per inference call and how long to wait for a batch to fill
+BATCH_SIZE = 16
+BATCH_WINDOW_SECONDS = 0.005
+
+
+class SharedDetector:
+    """
+    Batches vehicle detection requests from several pipelines.
+    
+    Each pipeline submits its frame and blocks on a future; a background
+    thread collects up to BATCH_SIZE pending frames, runs them through one
+    model call and resolves the futures. Drop-in for VehicleDetector: any
+    other attribute is delegated to the wrapped detector.
+    
+    Opt-in via SHARED_DETECTOR. It only pays off when several pipelines run
+    in the same process; a lone pipeline just waits out the batch window.
+    """
+    
+    _instance = None
+    _instance_lock = threading.Lock()
+    
+    def __init__(self, detector: VehicleDetector, batch_size: int = BATCH_SIZE,
+                 batch_window: float = BATCH_WINDOW_SECONDS):
+        """
+        Initialize the shared detector.
+        
+        Args:
+            detector: Vehicle detector that owns the model
+            batch_size: Maximum frames per inference call, capped at the
+                largest batch the detector's model accepts
+            batch_window: Seconds to wait for more frames before running a batch
+        """
+        self.detector = detector
+        self.batch_size = min(batch_size, detector.max_batch)
+        self.batch_window = batch_window
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._batch_loop, name="shared-detector", daemon=True)
+        self._thread.start()
+    
+    @classmethod
+    def instance(cls, config) -> "SharedDetector":
+        """
+        Get the process-wide shared detector, creating it on first use.
+        
+        Args:
+            config: Configuration settings
+        
+        Returns:
+            Shared detector instance
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(get_vehicle_detector(
+                    config.vehicle_model_path,
+                    config.vehicle_confidence_threshold,
+                    engine_path=config.vehicle_engine_path
+                ))
+            return cls._instance
+    
+    def __getattr__(self, name):
+        """Delegate everything else (get_largest_vehicle, etc.) to the detector."""
+        return getattr(self.detector, name)
+    
+    def preprocess(self, image: np.ndarray) -> None:
+        """Frames are preprocessed as part of the batch, so there is nothing to share."""
+        return None
+    
+    def detect(self, image: np.ndarray, preprocessed=None) -> List[dict]:
+        """
+        Detect vehicles in an image as part of the next batch.
+        
+        Args:
+            image: Input image as numpy array (BGR format)
+            preprocessed: Ignored; accepted for VehicleDetector compatibility
+        
+        Returns:
+            List of detections, each containing bbox, confidence, and class_id
+        """
+        future = Future()
+        self._queue.put((image, future))
+        try:
+            return future.result()
+        except Exception as e:
+            # Same contract as VehicleDetector.detect: log and report no vehicles
+            logger.error(f"Error during shared vehicle detection: {e}")
+            return []
+    
+    def _batch_loop(self):
+        """Collect pending frames into batches and run inference on them."""
+        while True:
+            pending = [self._queue.get()]
+            deadline = time.monotonic() + self.batch_window
+            
+            while len(pending) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            
+            frames = [frame for frame, _ in pending]
+            try:
+                batch = self.detector._detect_batch(frames, imgsz=INFERENCE_SIZE)
+                if len(batch) != len(pending):
+                    raise RuntimeError(f"Expected {len(pending)} results, got {len(batch)}")
+            except Exception as e:
+                # Fail every waiting pipeline rather than leave one blocked
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+            
+            logger.debug(f"Ran shared vehicle detection on {len(frames)} frames")
+            for (_, future), detections in zip(pending, batch):
+                future.set_result(detections)
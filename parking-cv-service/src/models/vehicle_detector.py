@@ -1,50 +1,135 @@
 """
 Vehicle detection module using YOLOv8.
 """
+import json
+import os
 import cv2
 import numpy as np
+import torch
+import torch.nn.functional as F
 from ultralytics import YOLO
 from typing import List, Tuple, Optional
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Dummy inference passes run at start-up so TensorRT/CUDA context setup is
+# not paid on the first real frame
+WARMUP_ITERATIONS = 3
+WARMUP_SHAPE = (640, 640, 3)
+
+# Frames per inference call in a batched detection; larger batches stop paying off
+# and start costing GPU memory
+MAX_BATCH_SIZE = 16
+
+# Long side of the letterboxed tensor fed to the model on the GPU upload path
+INFERENCE_SIZE = 640
+STRIDE = 32
+PAD_VALUE = 114 / 255
+
+
+def read_engine_metadata(engine_path: str) -> dict:
+    """
+    Read the metadata header Ultralytics writes in front of a TensorRT engine.
+    
+    Args:
+        engine_path: Path to an engine exported with `yolo export format=engine`
+        
+    Returns:
+        Export metadata (imgsz, batch, stride, names, ...), or an empty dict
+        if the file has no readable header
+    """
+    try:
+        with open(engine_path, 'rb') as f:
+            meta_len = int.from_bytes(f.read(4), byteorder='little')
+            return json.loads(f.read(meta_len).decode())
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read engine metadata from {engine_path}: {e}")
+        return {}
+
 
 class VehicleDetector:
     """Detects vehicles in images using YOLOv8."""
     
-    def __init__(self, model_path: str, confidence_threshold: float = 0.5):
+    def __init__(self, model_path: str, confidence_threshold: float = 0.5,
+                 engine_path: Optional[str] = None):
         """
         Initialize the vehicle detector.
         
         Args:
             model_path: Path to the YOLOv8 model weights
             confidence_threshold: Minimum confidence score for detections
+            engine_path: Path to an exported TensorRT engine, used instead
+                of model_path when the file exists
         """
         self.model_path = model_path
+        self.engine_path = engine_path
         self.confidence_threshold = confidence_threshold
         self.model = None
+        self.half = torch.cuda.is_available()  # FP16 inference on GPU
+        
+        # Input size and largest batch the model accepts; engines are built
+        # for the shape they were exported with, read back in _load_model
+        self.imgsz = INFERENCE_SIZE
+        self.max_batch = MAX_BATCH_SIZE
         self._load_model()
+        self._warmup()
+        
+        # Frames are staged in page-locked memory and uploaded on a side
+        # stream. Engines are built for a fixed input shape, so they keep
+        # Ultralytics' own preprocessing. The staging buffer is per thread
+        # and model calls are serialized, so one instance can be shared
+        # between pipelines.
+        self._local = threading.local()
+        self._infer_lock = threading.Lock()
+        self._stream = None
+        if torch.cuda.is_available() and not self.model_path.endswith('.engine'):
+            self._device = torch.device('cuda')
+            self._stream = torch.cuda.Stream()
         
         # Vehicle class IDs in COCO dataset
         self.vehicle_classes = [2, 3, 5, 7]  # car, motorcycle, bus, truck
     
     def _load_model(self):
         """Load the YOLOv8 model."""
+        if self.engine_path and os.path.exists(self.engine_path):
+            self.model_path = self.engine_path
+            metadata = read_engine_metadata(self.engine_path)
+            self.imgsz = metadata.get('imgsz', INFERENCE_SIZE)
+            self.max_batch = min(MAX_BATCH_SIZE, metadata.get('batch', 1))
+            logger.info(f"Vehicle engine input size {self.imgsz}, max batch {self.max_batch}")
+        
         try:
             logger.info(f"Loading vehicle detection model from {self.model_path}")
-            self.model = YOLO(self.model_path)
+            self.model = YOLO(self.model_path, task='detect')
             logger.info("Vehicle detection model loaded successfully")
         except Exception as e:
             logger.error(f"Failed to load vehicle detection model: {e}")
             raise
     
-    def detect(self, image: np.ndarray) -> List[dict]:
+    def _warmup(self):
+        """Run a few dummy inferences to initialize the inference backend."""
+        dummy = np.zeros(WARMUP_SHAPE, dtype=np.uint8)
+        try:
+            for _ in range(WARMUP_ITERATIONS):
+                self.model(dummy, imgsz=self.imgsz, half=self.half, verbose=False)
+            logger.debug("Vehicle detection model warmed up")
+        except Exception as e:
+            logger.error(
+                f"Vehicle model warmup failed for {self.model_path} (imgsz={self.imgsz}): {e}. "
+                "If this is a TensorRT engine, re-export it; detections will fail until then."
+            )
+    
+    def detect(self, image: np.ndarray,
+               preprocessed: Optional[Tuple[torch.Tensor, float]] = None) -> List[dict]:
         """
         Detect vehicles in an image.
         
         Args:
             image: Input image as numpy array (BGR format)
+            preprocessed: Result of preprocess(image), if the caller already
+                has it
             
         Returns:
             List of detections, each containing bbox, confidence, and class_id
@@ -53,25 +138,22 @@ class VehicleDetector:
             raise RuntimeError("Model not loaded")
         
         try:
-            results = self.model(image, conf=self.confidence_threshold, verbose=False)
+            if preprocessed is None:
+                preprocessed = self.preprocess(image)
+            
+            if preprocessed is not None:
+                tensor, scale = preprocessed
+                source = tensor
+            else:
+                scale = 1.0
+                source = image
+            with self._infer_lock:
+                results = self.model(source, conf=self.confidence_threshold, imgsz=self.imgsz,
+                                     half=self.half, verbose=False)
             detections = []
             
             for result in results:
-                boxes = result.boxes
-                for box in boxes:
-                    class_id = int(box.cls[0])
-                    
-                    # Filter only vehicle classes
-                    if class_id in self.vehicle_classes:
-                        x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                        confidence = float(box.conf[0])
-                        
-                        detections.append({
-                            'bbox': [int(x1), int(y1), int(x2), int(y2)],
-                            'confidence': confidence,
-                            'class_id': class_id,
-                            'class_name': self.model.names[class_id]
-                        })
+                detections.extend(self._result_to_detections(result, scale))
             
             logger.debug(f"Detected {len(detections)} vehicles")
             return detections
@@ -80,6 +162,98 @@ class VehicleDetector:
             logger.error(f"Error during vehicle detection: {e}")
             return []
     
+    def _detect_batch(self, images: List[np.ndarray], imgsz: int) -> List[List[dict]]:
+        """
+        Detect vehicles in several frames with batched inference.
+        
+        Used by SharedDetector. Frames are run through the model in chunks
+        of up to max_batch; inference errors propagate to the caller.
+        
+        Args:
+            images: Input images as numpy arrays (BGR format)
+            imgsz: Inference size every image is resized to; TensorRT
+                engines always use the size they were exported with
+            
+        Returns:
+            One list of detections per input image, in input order
+        """
+        if self.model_path.endswith('.engine'):
+            imgsz = self.imgsz
+        
+        batch = []
+        for start in range(0, len(images), self.max_batch):
+            chunk = images[start:start + self.max_batch]
+            with self._infer_lock:
+                results = self.model(chunk, conf=self.confidence_threshold,
+                                     imgsz=imgsz, half=self.half, verbose=False)
+            batch.extend(self._result_to_detections(result) for result in results)
+        
+        return batch
+    
+    def preprocess(self, image: np.ndarray) -> Optional[Tuple[torch.Tensor, float]]:
+        """
+        Copy a frame to the GPU through pinned memory and letterbox it there.
+        
+        The result can be passed to detect() and to
+        PlateDetector.detect_in_roi() so a frame is only preprocessed once.
+        
+        Args:
+            image: Input image as numpy array (BGR format)
+            
+        Returns:
+            Tuple of (1x3xHxW RGB float tensor on the GPU, resize scale), or
+            None when the GPU upload path is not in use; padding is added
+            bottom/right only, so boxes map back by dividing by the scale
+        """
+        if self._stream is None:
+            return None
+        
+        pinned = getattr(self._local, 'pinned', None)
+        if pinned is None or tuple(pinned.shape) != image.shape:
+            pinned = self._local.pinned = torch.empty(image.shape, dtype=torch.uint8).pin_memory()
+        pinned.numpy()[...] = image
+        
+        h, w = image.shape[:2]
+        scale = INFERENCE_SIZE / max(h, w)
+        new_h, new_w = round(h * scale), round(w * scale)
+        
+        with torch.cuda.stream(self._stream):
+            tensor = pinned.to(self._device, non_blocking=True)
+            tensor = tensor.permute(2, 0, 1).flip(0).unsqueeze(0).float().div_(255)
+            tensor = F.interpolate(tensor, size=(new_h, new_w), mode='bilinear', align_corners=False)
+            tensor = F.pad(tensor, (0, -new_w % STRIDE, 0, -new_h % STRIDE), value=PAD_VALUE)
+        torch.cuda.current_stream().wait_stream(self._stream)
+        
+        return tensor, scale
+    
+    def _result_to_detections(self, result, scale: float = 1.0) -> List[dict]:
+        """
+        Convert one Ultralytics result into vehicle detection dicts.
+        
+        Args:
+            result: Single Ultralytics Results object
+            scale: Factor the input was resized by before inference
+            
+        Returns:
+            List of vehicle detections (non-vehicle classes dropped)
+        """
+        boxes = result.boxes
+        class_ids = boxes.cls.cpu().numpy().astype(np.int32)
+        keep = np.isin(class_ids, self.vehicle_classes)
+        
+        xyxy = (boxes.xyxy.cpu().numpy() / scale).astype(np.int32)[keep]
+        conf = boxes.conf.cpu().numpy()[keep]
+        
+        return [
+            {
+                'bbox': bbox,
+                'confidence': confidence,
+                'class_id': class_id,
+                'class_name': self.model.names[class_id]
+            }
+            for bbox, confidence, class_id in zip(xyxy.tolist(), conf.tolist(), class_ids[keep].tolist())
+        ]
+    
     def get_largest_vehicle(self, detections: List[dict]) -> Optional[dict]:
         """
         Get the largest vehicle detection from a list of detections.
@@ -93,27 +267,28 @@ class VehicleDetector:
         if not detections:
             return None
         
-        largest = max(detections, key=lambda d: self._bbox_area(d['bbox']))
-        return largest
+        boxes = np.array([d['bbox'] for d in detections], dtype=np.int64)
+        return detections[int(self._bbox_areas(boxes).argmax())]
     
     @staticmethod
-    def _bbox_area(bbox: List[int]) -> int:
-        """Calculate bounding box area."""
-        x1, y1, x2, y2 = bbox
-        return (x2 - x1) * (y2 - y1)
+    def _bbox_areas(boxes: np.ndarray) -> np.ndarray:
+        """Calculate the areas of an (N, 4) array of bounding boxes."""
+        return (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
     
-    def draw_detections(self, image: np.ndarray, detections: List[dict]) -> np.ndarray:
+    def draw_detections(self, image: np.ndarray, detections: List[dict], *,
+                        inplace: bool = False) -> np.ndarray:
         """
         Draw bounding boxes on image.
         
         Args:
             image: Input image
             detections: List of detections
+            inplace: Draw directly on image instead of a copy
             
         Returns:
             Image with drawn bounding boxes
         """
-        img_copy = image.copy()
+        img_copy = image if inplace else image.copy()
         
         for det in detections:
             x1, y1, x2, y2 = det['bbox']
@@ -5,45 +5,63 @@ import cv2
 import numpy as np
 from typing import Optional, Dict
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime
 
-from ..models import VehicleDetector, PlateDetector, PlateOCR
+from ..models import PlateDetector, PlateOCR, SharedDetector, get_vehicle_detector
 from ..clients.backend_client import BackendClient
-from ..config import Config
+from ..config import Settings
+from .frame_grabber import FrameGrabber, open_capture
 
 logger = logging.getLogger(__name__)
 
+# A plate seen again within this many seconds is treated as a duplicate
+DEDUP_WINDOW_SECONDS = 10
+# Number of distinct recent plates remembered for deduplication
+DEDUP_CACHE_SIZE = 64
+
 
 class EntryPipeline:
     """Pipeline for processing vehicle entries."""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Settings):
         """
         Initialize the entry pipeline.
         
         Args:
-            config: Configuration object
+            config: Configuration settings
         """
         self.config = config
         
-        # Initialize components
-        self.vehicle_detector = VehicleDetector(
-            config.VEHICLE_MODEL_PATH,
-            config.VEHICLE_CONFIDENCE_THRESHOLD
-        )
+        # Initialize components; with shared_detector, pipelines in this
+        # process batch their vehicle detection through one model
+        if config.shared_detector:
+            self.vehicle_detector = SharedDetector.instance(config)
+        else:
+            self.vehicle_detector = get_vehicle_detector(
+                config.vehicle_model_path,
+                config.vehicle_confidence_threshold,
+                engine_path=config.vehicle_engine_path
+            )
         self.plate_detector = PlateDetector(
-            config.PLATE_MODEL_PATH,
-            config.PLATE_CONFIDENCE_THRESHOLD
+            config.plate_model_path,
+            config.plate_confidence_threshold,
+            roi_from_tensor=config.plate_roi_from_tensor
         )
         self.plate_ocr = PlateOCR(
-            config.OCR_LANGUAGES,
-            config.OCR_CONFIDENCE_THRESHOLD
+            config.ocr_languages,
+            config.ocr_confidence_threshold,
+            cpu_quantize=config.ocr_cpu_quantize
+        )
+        self.backend_client = BackendClient(
+            config.backend_url,
+            config.api_key,
+            internal_secret=config.internal_api_secret
         )
-        self.backend_client = BackendClient(config.BACKEND_URL, config.API_KEY)
         
         self.frame_count = 0
-        self.last_processed_plate = None
-        self.last_processed_time = None
+        self._recent_plates = OrderedDict()  # plate -> time.monotonic() when processed
     
     def process_frame(self, frame: np.ndarray) -> Optional[Dict]:
         """
@@ -58,13 +76,20 @@ class EntryPipeline:
         self.frame_count += 1
         
         # Skip frames for performance
-        if self.frame_count % self.config.FRAME_SKIP != 0:
+        if self.frame_count % self.config.frame_skip != 0:
+            return None
+        
+        # Skip the whole detection path while the scene is static
+        if not self.plate_detector.should_run(frame):
             return None
         
         logger.debug(f"Processing frame {self.frame_count}")
         
+        # Preprocess once; both detectors reuse the letterboxed tensor
+        preprocessed = self.vehicle_detector.preprocess(frame)
+        
         # Step 1: Detect vehicles
-        vehicle_detections = self.vehicle_detector.detect(frame)
+        vehicle_detections = self.vehicle_detector.detect(frame, preprocessed)
         
         if not vehicle_detections:
             logger.debug("No vehicles detected")
@@ -75,7 +100,7 @@ class EntryPipeline:
         logger.info(f"Detected {vehicle['class_name']} with confidence {vehicle['confidence']:.2f}")
         
         # Step 2: Detect license plate in vehicle ROI
-        plate_detections = self.plate_detector.detect_in_roi(frame, vehicle['bbox'])
+        plate_detections = self.plate_detector.detect_in_roi(frame, vehicle['bbox'], preprocessed)
         
         if not plate_detections:
             logger.debug("No license plates detected")
@@ -99,16 +124,19 @@ class EntryPipeline:
             return None
         
         # Check for duplicate processing (same plate within time window)
-        current_time = datetime.now()
-        if (self.last_processed_plate == plate_text and 
-            self.last_processed_time and 
-            (current_time - self.last_processed_time).seconds < 10):
+        now = time.monotonic()
+        last_seen = self._recent_plates.get(plate_text)
+        if last_seen is not None and now - last_seen < DEDUP_WINDOW_SECONDS:
             logger.debug(f"Skipping duplicate plate: {plate_text}")
             return None
         
         # Update last processed
-        self.last_processed_plate = plate_text
-        self.last_processed_time = current_time
+        self._recent_plates[plate_text] = now
+        self._recent_plates.move_to_end(plate_text)
+        if len(self._recent_plates) > DEDUP_CACHE_SIZE:
+            self._recent_plates.popitem(last=False)
+        
+        timestamp = datetime.now().isoformat()
         
         logger.info(f"Successfully processed entry for plate: {plate_text}")
         
@@ -118,7 +146,7 @@ class EntryPipeline:
             'vehicle_type': vehicle['class_name'],
             'vehicle_confidence': vehicle['confidence'],
             'plate_confidence': plate['confidence'],
-            'timestamp': current_time.isoformat(),
+            'timestamp': timestamp,
             'frame': frame,
             'vehicle_bbox': vehicle['bbox'],
             'plate_bbox': plate['bbox'],
@@ -130,7 +158,7 @@ class EntryPipeline:
             response = self.backend_client.register_entry(
                 plate_number=plate_text,
                 vehicle_type=vehicle['class_name'],
-                timestamp=current_time.isoformat(),
+                timestamp=timestamp,
                 confidence=plate['confidence']
             )
             result['backend_response'] = response
@@ -150,7 +178,7 @@ class EntryPipeline:
             display: Whether to display the video feed
         """
         if camera_source is None:
-            camera_source = self.config.ENTRY_CAMERA_URL
+            camera_source = self.config.entry_camera_url
         
         # Try to convert to int if it's a device index
         try:
@@ -160,15 +188,18 @@ class EntryPipeline:
         
         logger.info(f"Starting entry pipeline with camera: {camera_source}")
         
-        cap = cv2.VideoCapture(camera_source)
+        cap = open_capture(camera_source)
         
         if not cap.isOpened():
             logger.error(f"Failed to open camera: {camera_source}")
             return
         
+        # Decode on a background thread so inference never waits on capture
+        grabber = FrameGrabber(cap).start()
+        
         try:
             while True:
-                ret, frame = cap.read()
+                ret, frame = grabber.read()
                 
                 if not ret:
                     logger.warning("Failed to read frame")
@@ -179,7 +210,8 @@ class EntryPipeline:
                 
                 # Display if enabled
                 if display:
-                    display_frame = frame.copy()
+                    # Each captured frame is fresh, so draw on it directly
+                    display_frame = frame
                     
                     if result:
                         # Draw detections
@@ -203,7 +235,8 @@ class EntryPipeline:
                         break
         
         finally:
-            cap.release()
+            grabber.stop()
             if display:
                 cv2.destroyAllWindows()
+            self.backend_client.close()
             logger.info("Entry pipeline stopped")
@@ -0,0 +1,119 @@
+"""
+Background frame capture for the processing pipelines.
+"""
+import cv2
+import numpy as np
+from typing import Optional, Tuple, Union
+import logging
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def open_capture(camera_source: Union[int, str]) -> cv2.VideoCapture:
+    """
+    Open a camera source, decoding network streams on the GPU when possible.
+    
+    Stream URLs and files go through the FFmpeg backend with hardware
+    acceleration requested (NVDEC / VAAPI / VideoToolbox, whichever is
+    available). OpenCV falls back to software decode otherwise. Device
+    indices keep the default backend, since local cameras are not
+    FFmpeg sources.
+    
+    Args:
+        camera_source: Stream URL, file path or device index
+        
+    Returns:
+        Video capture (check isOpened() before use)
+    """
+    if isinstance(camera_source, int):
+        cap = cv2.VideoCapture(camera_source)
+    else:
+        # Acceleration must be requested at open time; setting it afterwards has no effect
+        cap = cv2.VideoCapture(camera_source, cv2.CAP_FFMPEG,
+                               [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+    
+    # Keep the driver-side buffer minimal so frames are as fresh as possible
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
+
+class FrameGrabber:
+    """
+    Reads frames from a VideoCapture on a background thread.
+    
+    Decoding overlaps with inference on the consumer thread. The queue is
+    kept short and the oldest frame is dropped when it is full, so the
+    consumer always works on a recent frame instead of falling behind.
+    
+    The grabber owns the capture once started: it is released by the
+    capture thread itself when it exits, never while a read is in flight.
+    """
+    
+    def __init__(self, cap: cv2.VideoCapture, maxsize: int = 2):
+        """
+        Initialize the frame grabber.
+        
+        Args:
+            cap: Opened video capture to read from
+            maxsize: Maximum number of frames buffered ahead of the consumer
+        """
+        self.cap = cap
+        self.frames = queue.Queue(maxsize=maxsize)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._grab_loop, name="frame-grabber", daemon=True)
+    
+    def start(self) -> "FrameGrabber":
+        """Start the capture thread."""
+        self._thread.start()
+        return self
+    
+    def _grab_loop(self):
+        """Read frames until the stream ends or stop() is called, then release the capture."""
+        try:
+            while not self._stopped.is_set():
+                ret, frame = self.cap.read()
+                if not ret:
+                    break
+                self._put((True, frame))
+        except Exception as e:
+            logger.error(f"Frame capture failed: {e}")
+        finally:
+            # Always end with the sentinel so read() can't block forever
+            self._put((False, None))
+            self.cap.release()
+    
+    def _put(self, item: Tuple[bool, Optional[np.ndarray]]):
+        """Queue an item, dropping the oldest frame to stay real-time."""
+        while True:
+            try:
+                self.frames.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self.frames.get_nowait()
+                except queue.Empty:
+                    pass
+    
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Get the next captured frame, mirroring cv2.VideoCapture.read().
+        
+        Returns:
+            Tuple of (success flag, frame); (False, None) once the stream ends
+        """
+        return self.frames.get()
+    
+    def stop(self):
+        """
+        Stop the capture thread.
+        
+        The capture is released by the thread on its way out; if it is
+        still blocked in a read after the timeout, that happens once the
+        read returns.
+        """
+        self._stopped.set()
+        self._thread.join(timeout=1)
+        if self._thread.is_alive():
+            logger.warning("Frame grabber still blocked in read; capture will be released when it returns")
@@ -3,41 +3,83 @@ Indoor pipeline for parking spot monitoring.
 """
 import cv2
 import numpy as np
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 import logging
 from datetime import datetime
 
-from ..models import VehicleDetector
+from ..models import VehicleDetector, SharedDetector, get_vehicle_detector
 from ..clients.backend_client import BackendClient
-from ..config import Config
+from ..config import Settings
+from .frame_grabber import FrameGrabber, open_capture
 
 logger = logging.getLogger(__name__)
 
+# Fraction of a spot a vehicle box must cover for the spot to count as occupied
+SPOT_COVERAGE_THRESHOLD = 0.3
+
+# Per-spot motion gate: each spot is reduced to an 8x8 thumbnail and only
+# re-evaluated when its mean absolute change exceeds the threshold
+SPOT_THUMB_SIZE = (8, 8)
+SPOT_MOTION_THRESHOLD = 4.0
+
+
+def spot_coverage(spot_boxes: np.ndarray, det_boxes: np.ndarray) -> np.ndarray:
+    """
+    Compute intersection-over-spot-area for every spot/detection pair.
+    
+    Args:
+        spot_boxes: (N, 4) array of spot boxes [x1, y1, x2, y2]
+        det_boxes: (M, 4) array of detection boxes [x1, y1, x2, y2]
+        
+    Returns:
+        (N, M) array of the fraction of each spot covered by each detection
+    """
+    xa = np.maximum(spot_boxes[:, None, 0], det_boxes[None, :, 0])
+    ya = np.maximum(spot_boxes[:, None, 1], det_boxes[None, :, 1])
+    xb = np.minimum(spot_boxes[:, None, 2], det_boxes[None, :, 2])
+    yb = np.minimum(spot_boxes[:, None, 3], det_boxes[None, :, 3])
+    
+    intersection = np.clip(xb - xa, 0, None) * np.clip(yb - ya, 0, None)
+    spot_areas = VehicleDetector._bbox_areas(spot_boxes)
+    
+    return intersection / np.maximum(spot_areas, 1)[:, None]
+
 
 class IndoorPipeline:
     """Pipeline for monitoring indoor parking spots."""
     
-    def __init__(self, config: Config, parking_spots: Optional[List[Dict]] = None):
+    def __init__(self, config: Settings, parking_spots: Optional[List[Dict]] = None):
         """
         Initialize the indoor pipeline.
         
         Args:
-            config: Configuration object
+            config: Configuration settings
             parking_spots: List of parking spot definitions (optional)
         """
         self.config = config
         
-        # Initialize components
-        self.vehicle_detector = VehicleDetector(
-            config.VEHICLE_MODEL_PATH,
-            config.VEHICLE_CONFIDENCE_THRESHOLD
+        # Initialize components; with shared_detector, pipelines in this
+        # process batch their vehicle detection through one model
+        if config.shared_detector:
+            self.vehicle_detector = SharedDetector.instance(config)
+        else:
+            self.vehicle_detector = get_vehicle_detector(
+                config.vehicle_model_path,
+                config.vehicle_confidence_threshold,
+                engine_path=config.vehicle_engine_path
+            )
+        self.backend_client = BackendClient(
+            config.backend_url,
+            config.api_key,
+            internal_secret=config.internal_api_secret
         )
-        self.backend_client = BackendClient(config.BACKEND_URL, config.API_KEY)
         
         # Parking spots configuration
         # Format: [{'id': 'A1', 'bbox': [x1, y1, x2, y2]}, ...]
         self.parking_spots = parking_spots or []
         self.spot_states = {}  # Track occupancy state
+        self._spot_thumbs = {}  # Last evaluated thumbnail per spot
+        self._prepare_spot_drawing()
         
         self.frame_count = 0
     
@@ -50,38 +92,83 @@ class IndoorPipeline:
         """
         self.parking_spots = spots
         self.spot_states = {spot['id']: False for spot in spots}
+        self._spot_thumbs = {}
+        self._prepare_spot_drawing()
         logger.info(f"Configured {len(spots)} parking spots")
     
-    def is_spot_occupied(self, frame: np.ndarray, spot_bbox: List[int]) -> bool:
+    def _prepare_spot_drawing(self):
+        """Precompute spot outlines for drawing; the label patches are rendered lazily."""
+        self._spot_corners = np.array(
+            [[x1, y1, x2, y1, x2, y2, x1, y2]
+             for x1, y1, x2, y2 in (spot['bbox'] for spot in self.parking_spots)],
+            dtype=np.int32
+        ).reshape(-1, 4, 1, 2)
+        self._label_patches = None
+    
+    def _get_label_patches(self) -> Dict[bool, List[Tuple[int, int, np.ndarray, np.ndarray]]]:
         """
-        Check if a parking spot is occupied.
+        Get every spot label prerendered in both states, rendering them on first use.
+        
+        Returns:
+            For occupied (True) and available (False), one (x, y, patch, mask)
+            per spot: the label image, its top-left corner in the frame and
+            the mask of its text pixels
+        """
+        if self._label_patches is None:
+            pad = 2
+            self._label_patches = {True: [], False: []}
+            for spot in self.parking_spots:
+                x1, y1 = spot['bbox'][:2]
+                for is_occupied, status, color in ((True, "OCCUPIED", (0, 0, 255)),
+                                                   (False, "AVAILABLE", (0, 255, 0))):
+                    label = f"{spot['id']}: {status}"
+                    (width, height), baseline = cv2.getTextSize(
+                        label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)
+                    patch = np.zeros((height + baseline + 2 * pad, width + 2 * pad, 3),
+                                     dtype=np.uint8)
+                    cv2.putText(patch, label, (pad, height + pad),
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+                    self._label_patches[is_occupied].append(
+                        (x1 - pad, y1 - 10 - height - pad, patch, patch.any(axis=2)))
+        
+        return self._label_patches
+    
+    def changed_spots(self, frame: np.ndarray) -> List[bool]:
+        """
+        Flag the parking spots whose pixels changed since they were last evaluated.
         
         Args:
             frame: Input frame
-            spot_bbox: Bounding box of parking spot [x1, y1, x2, y2]
             
         Returns:
-            True if occupied, False otherwise
+            One flag per configured spot, True if it needs re-detection
         """
-        # Extract spot ROI
-        x1, y1, x2, y2 = spot_bbox
-        spot_roi = frame[y1:y2, x1:x2]
-        
-        # Detect vehicles in spot
-        detections = self.vehicle_detector.detect(spot_roi)
-        
-        # Consider occupied if any vehicle detected with sufficient overlap
-        if detections:
-            for det in detections:
-                # Calculate overlap with spot (simplified)
-                det_area = self.vehicle_detector._bbox_area(det['bbox'])
-                spot_area = (x2 - x1) * (y2 - y1)
-                
-                # If detection covers significant portion of spot, it's occupied
-                if det_area > spot_area * 0.3:
-                    return True
+        changed = []
+        height, width = frame.shape[:2]
+        
+        for spot in self.parking_spots:
+            x1, y1, x2, y2 = spot['bbox']
+            x1, x2 = max(x1, 0), min(x2, width)
+            y1, y2 = max(y1, 0), min(y2, height)
+            
+            if x2 <= x1 or y2 <= y1:
+                # Spot lies outside the frame; re-evaluate once if it was
+                # visible before (nothing can be detected there, so it
+                # clears), otherwise leave it unoccupied and skip it
+                changed.append(self._spot_thumbs.pop(spot['id'], None) is not None)
+                continue
+            
+            thumb = cv2.resize(frame[y1:y2, x1:x2], SPOT_THUMB_SIZE,
+                               interpolation=cv2.INTER_AREA).astype(np.int16)
+            previous = self._spot_thumbs.get(spot['id'])
+            
+            if previous is None or np.abs(thumb - previous).mean() > SPOT_MOTION_THRESHOLD:
+                self._spot_thumbs[spot['id']] = thumb
+                changed.append(True)
+            else:
+                changed.append(False)
         
-        return False
+        return changed
     
     def process_frame(self, frame: np.ndarray) -> Optional[Dict]:
         """
@@ -96,7 +183,7 @@ class IndoorPipeline:
         self.frame_count += 1
         
         # Skip frames for performance
-        if self.frame_count % self.config.FRAME_SKIP != 0:
+        if self.frame_count % self.config.frame_skip != 0:
             return None
         
         if not self.parking_spots:
@@ -105,16 +192,28 @@ class IndoorPipeline:
         
         logger.debug(f"Processing frame {self.frame_count}")
         
-        # Check each parking spot
         occupancy_changes = []
         current_states = {}
         
-        for spot in self.parking_spots:
-            spot_id = spot['id']
-            spot_bbox = spot['bbox']
+        # Unchanged spots keep their last label; detection only runs when
+        # at least one spot moved
+        changed = self.changed_spots(frame)
+        occupied = [self.spot_states.get(spot['id'], False) for spot in self.parking_spots]
+        
+        if any(changed):
+            # Detect once on the whole frame and match detections to spots
+            detections = self.vehicle_detector.detect(frame)
+            spot_boxes = np.array([spot['bbox'] for spot in self.parking_spots], dtype=np.float32)
+            det_boxes = np.array([det['bbox'] for det in detections], dtype=np.float32).reshape(-1, 4)
+            detected = (spot_coverage(spot_boxes, det_boxes) > SPOT_COVERAGE_THRESHOLD).any(axis=1)
             
-            # Check occupancy
-            is_occupied = self.is_spot_occupied(frame, spot_bbox)
+            occupied = [
+                fresh if spot_changed else prior
+                for fresh, spot_changed, prior in zip(detected.tolist(), changed, occupied)
+            ]
+        
+        for spot, is_occupied in zip(self.parking_spots, occupied):
+            spot_id = spot['id']
             current_states[spot_id] = is_occupied
             
             # Detect state change
@@ -150,40 +249,58 @@ class IndoorPipeline:
                 )
                 result['backend_response'] = response
                 logger.info(f"Parking status updated: {response}")
+                
+                # Earlier queued updates that the flusher could not deliver
+                if response.get('failed_updates'):
+                    result['backend_error'] = (
+                        f"{response['failed_updates']} queued parking status updates failed: "
+                        f"{self.backend_client.last_status_error}"
+                    )
             except Exception as e:
                 logger.error(f"Failed to update parking status: {e}")
                 result['backend_error'] = str(e)
         
         return result
     
-    def draw_parking_spots(self, frame: np.ndarray) -> np.ndarray:
+    def draw_parking_spots_inplace(self, frame: np.ndarray) -> np.ndarray:
         """
         Draw parking spots on frame with occupancy status.
         
+        The frame is modified in place; callers that need the original
+        pixels should pass a copy.
+        
         Args:
-            frame: Input frame
+            frame: Input frame, drawn on directly
             
         Returns:
-            Frame with drawn parking spots
+            The same frame, for convenience
         """
-        display_frame = frame.copy()
+        display_frame = frame
         
-        for spot in self.parking_spots:
-            spot_id = spot['id']
-            x1, y1, x2, y2 = spot['bbox']
-            is_occupied = self.spot_states.get(spot_id, False)
-            
-            # Color: red if occupied, green if available
-            color = (0, 0, 255) if is_occupied else (0, 255, 0)
+        if self.parking_spots:
+            occupied_mask = np.array(
+                [self.spot_states.get(spot['id'], False) for spot in self.parking_spots]
+            )
             
-            # Draw rectangle
-            cv2.rectangle(display_frame, (x1, y1), (x2, y2), color, 2)
+            # One polylines call per color: red if occupied, green if available
+            for mask, color in ((occupied_mask, (0, 0, 255)), (~occupied_mask, (0, 255, 0))):
+                if mask.any():
+                    cv2.polylines(display_frame, list(self._spot_corners[mask]), True, color, 2)
             
-            # Draw label
-            status = "OCCUPIED" if is_occupied else "AVAILABLE"
-            label = f"{spot_id}: {status}"
-            cv2.putText(display_frame, label, (x1, y1 - 10),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+            # Paste each spot's prerendered label for its current state
+            frame_height, frame_width = display_frame.shape[:2]
+            label_patches = self._get_label_patches()
+            for index, is_occupied in enumerate(occupied_mask.tolist()):
+                x, y, patch, mask = label_patches[is_occupied][index]
+                left, top = max(x, 0), max(y, 0)
+                right = min(x + patch.shape[1], frame_width)
+                bottom = min(y + patch.shape[0], frame_height)
+                if right <= left or bottom <= top:
+                    continue
+                
+                crop = (slice(top - y, bottom - y), slice(left - x, right - x))
+                text = mask[crop]
+                display_frame[top:bottom, left:right][text] = patch[crop][text]
         
         # Draw summary
         total = len(self.parking_spots)
@@ -204,7 +321,7 @@ class IndoorPipeline:
             display: Whether to display the video feed
         """
         if camera_source is None:
-            camera_source = self.config.INDOOR_CAMERA_URL
+            camera_source = self.config.indoor_camera_url
         
         # Try to convert to int if it's a device index
         try:
@@ -217,15 +334,18 @@ class IndoorPipeline:
         if not self.parking_spots:
             logger.warning("No parking spots configured. Use set_parking_spots() first.")
         
-        cap = cv2.VideoCapture(camera_source)
+        cap = open_capture(camera_source)
         
         if not cap.isOpened():
             logger.error(f"Failed to open camera: {camera_source}")
             return
         
+        # Decode on a background thread so inference never waits on capture
+        grabber = FrameGrabber(cap).start()
+        
         try:
             while True:
-                ret, frame = cap.read()
+                ret, frame = grabber.read()
                 
                 if not ret:
                     logger.warning("Failed to read frame")
@@ -236,14 +356,14 @@ class IndoorPipeline:
                 
                 # Display if enabled
                 if display:
-                    display_frame = self.draw_parking_spots(frame)
-                    cv2.imshow('Indoor Pipeline', display_frame)
+                    cv2.imshow('Indoor Pipeline', self.draw_parking_spots_inplace(frame))
                     
                     if cv2.waitKey(1) & 0xFF == ord('q'):
                         break
         
         finally:
-            cap.release()
+            grabber.stop()
             if display:
                 cv2.destroyAllWindows()
+            self.backend_client.close()
             logger.info("Indoor pipeline stopped")